@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Benchmark dictionary loading, segmentation and tone formatting
+
+Results are written as JSON (stdout or --output) so runs can be compared as
+the dictionary grows; a readable summary goes to stderr. The README budgets
+("< 100ms response time", "< 1 second for pinyin data") are checked too.
+
+Examples:
+    python3 benchmark_pinyin.py --output bench.json
+    python3 benchmark_pinyin.py --quick
+"""
+
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from pinyin_engine import Converter, load_dictionary
+from pinyin_engine.binary import DEFAULT_BINARY_PATH, BinaryDictionary, ensure_binary_dictionary
+from pinyin_engine.dictionary import DEFAULT_MAP_PATH, PROJECT_ROOT, load_pinyin_map
+from pinyin_engine.mapdiff import find_map_files
+from pinyin_engine.shards import ShardedDictionary, ensure_sharded_dictionary
+
+# Budgets from the README's performance section
+LOAD_BUDGET_MS = 1000
+CONVERSION_BUDGET_MS = 100
+
+CORPUS_LENGTHS = [16, 256, 4096, 65536]
+
+# Measured in a fresh interpreter so nothing is already imported or cached
+COLD_LOAD_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {others!r})
+from benchmark_pinyin import peak_rss_kb
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "peak_rss_kb": peak_rss_kb()}}))
+"""
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in kilobytes"""
+    # Linux carries ru_maxrss over from the parent across fork/exec, VmHWM starts fresh
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def time_repeated(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run func repeat times and report min/median/max in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"min_ms": samples[0], "median_ms": samples[len(samples) // 2], "max_ms": samples[-1]}
+
+
+def cold_load(load_statement: str) -> Dict[str, Any]:
+    script = COLD_LOAD_SCRIPT.format(others=str(Path(__file__).resolve().parent), load=load_statement)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    return json.loads(result.stdout)
+
+
+def bench_loading(repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for path in find_map_files():
+        entry: Dict[str, Any] = {
+            "path": str(path.relative_to(PROJECT_ROOT)),
+            "bytes": path.stat().st_size,
+        }
+        entry["cold"] = cold_load(
+            f"from pinyin_engine.dictionary import load_pinyin_map\nload_pinyin_map({str(path)!r})"
+        )
+        if "error" not in entry["cold"]:
+            entry["entries"] = len(load_pinyin_map(path))
+            entry["warm"] = time_repeated(lambda: load_pinyin_map(path), repeat)
+            entry["within_budget"] = entry["cold"]["ms"] < LOAD_BUDGET_MS
+        results.append(entry)
+
+    binary_path = ensure_binary_dictionary(DEFAULT_MAP_PATH, DEFAULT_BINARY_PATH)
+    entry = {"path": str(binary_path.relative_to(PROJECT_ROOT)), "bytes": binary_path.stat().st_size}
+    entry["cold"] = cold_load(
+        f"from pinyin_engine.binary import BinaryDictionary\nBinaryDictionary({str(binary_path)!r})"
+    )
+    entry["warm"] = time_repeated(lambda: BinaryDictionary(binary_path).close(), repeat)
+    entry["within_budget"] = entry["cold"].get("ms", LOAD_BUDGET_MS) < LOAD_BUDGET_MS
+    results.append(entry)
+
+    # Sharded: the index plus the one shard common text needs
+    shards_path = ensure_sharded_dictionary(DEFAULT_MAP_PATH)
+    entry = {
+        "path": str(shards_path.relative_to(PROJECT_ROOT)),
+        "bytes": sum(path.stat().st_size for path in shards_path.glob("*.json")),
+    }
+    load_statement = f"from pinyin_engine.shards import ShardedDictionary\nShardedDictionary({str(shards_path)!r}).get('中')"
+    entry["cold"] = cold_load(load_statement)
+    entry["warm"] = time_repeated(lambda: ShardedDictionary(shards_path).get("中"), repeat)
+    entry["within_budget"] = entry["cold"].get("ms", LOAD_BUDGET_MS) < LOAD_BUDGET_MS
+    results.append(entry)
+    return results
+
+
+def make_corpus(pinyin_map: Dict[str, List[str]], length: int, seed: int = 0) -> str:
+    """Product-title-like text: mostly common characters, some words, some ASCII"""
+    rng = random.Random(seed)
+    common = [key for key in pinyin_map if len(key) == 1 and "一" <= key <= "鿿"]
+    words = [key for key in pinyin_map if len(key) > 1]
+    ascii_tokens = [" ", " ", "-", "/", "2024", "XL", "128GB", "iPhone", "，", "。"]
+    parts = []
+    size = 0
+    while size < length:
+        roll = rng.random()
+        if roll < 0.15 and words:
+            part = rng.choice(words)
+        elif roll < 0.9:
+            # Favour the lower (more frequent) part of the URO block
+            part = common[int(len(common) * rng.random() ** 3)]
+        else:
+            part = rng.choice(ascii_tokens)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:length]
+
+
+def bench_conversion(repeat: int, lengths: List[int]) -> Dict[str, Any]:
+    dictionary = load_dictionary()
+    converter = Converter(dictionary)
+    pinyin_map = {key: list(dictionary[key]) for key in dictionary}
+    results: Dict[str, Any] = {"segmentation": [], "tone_number": []}
+
+    for length in lengths:
+        text = make_corpus(pinyin_map, length)
+        converter.convert(text)  # warm-up
+        runs = max(1, repeat * 4096 // max(length, 1))
+
+        timing = time_repeated(lambda: converter.convert_with_details(text), runs)
+        timing.update({
+            "chars": length,
+            "chars_per_sec": length / (timing["median_ms"] / 1000) if timing["median_ms"] else None,
+            "within_budget": timing["median_ms"] < CONVERSION_BUDGET_MS,
+        })
+        results["segmentation"].append(timing)
+
+        marked = converter.convert(text)
+        timing = time_repeated(lambda: converter.forms.to_numbers(marked), runs)
+        timing.update({
+            "chars": len(marked),
+            "chars_per_sec": len(marked) / (timing["median_ms"] / 1000) if timing["median_ms"] else None,
+        })
+        results["tone_number"].append(timing)
+    return results
+
+
+def summarize(report: Dict[str, Any]):
+    out = sys.stderr
+    print("Dictionary loading (cold = fresh interpreter):", file=out)
+    for entry in report["loading"]:
+        cold = entry["cold"]
+        if "error" in cold:
+            print(f"  {entry['path']}: {cold['error']}", file=out)
+            continue
+        print(f"  {entry['path']}: cold {cold['ms']:.1f} ms ({cold['peak_rss_kb'] / 1024:.1f} MB peak), "
+              f"warm {entry['warm']['median_ms']:.1f} ms", file=out)
+    print("Segmentation:", file=out)
+    for timing in report["conversion"]["segmentation"]:
+        print(f"  {timing['chars']:>6} chars: {timing['median_ms']:.3f} ms "
+              f"({timing['chars_per_sec'] or 0:,.0f} chars/s)", file=out)
+    print("Tone numbers:", file=out)
+    for timing in report["conversion"]["tone_number"]:
+        print(f"  {timing['chars']:>6} chars: {timing['median_ms']:.3f} ms", file=out)
+    print(f"Peak RSS: {report['peak_rss_kb'] / 1024:.1f} MB", file=out)
+    print(f"Within README budgets: {report['within_budget']}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pinyin conversion engine")
+    parser.add_argument("-o", "--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per measurement")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions and shorter corpora")
+    args = parser.parse_args()
+
+    repeat = 2 if args.quick else args.repeat
+    lengths = CORPUS_LENGTHS[:3] if args.quick else CORPUS_LENGTHS
+
+    report: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "loading": bench_loading(repeat),
+        "conversion": bench_conversion(repeat, lengths),
+    }
+    report["peak_rss_kb"] = peak_rss_kb()
+    report["within_budget"] = all(
+        entry.get("within_budget", True) for entry in report["loading"]
+    ) and all(timing["within_budget"] for timing in report["conversion"]["segmentation"] if timing["chars"] <= 256)
+
+    summarize(report)
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
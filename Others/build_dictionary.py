@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build pinyin_map.json for Android, iOS and Web (plus compact variants) from the canonical source
+
+The canonical source is described by dictionary/dictionary.json: the base map
+and the overlays in dictionary/overlays/ that replace the per-platform
+add_*.py and convert_pinyin_map.py scripts, shared or per platform variant,
+plus the pinyin_map.overlay.jsonl log patch_pinyin_map.py keeps next to each
+platform's map. Outputs whose content is unchanged are left untouched.
+
+Examples:
+    python3 build_dictionary.py            # write changed outputs
+    python3 build_dictionary.py --check    # exit 1 if any existing output is out of date
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from pinyin_engine.build import DEFAULT_MANIFEST_PATH, build_outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build every platform's pinyin_map.json in one pass")
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST_PATH), help="build manifest")
+    parser.add_argument("--check", action="store_true",
+                        help="only report outputs that would change; exit 1 if an existing one would")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    statuses = build_outputs(args.manifest, dry_run=args.check)
+    elapsed = time.perf_counter() - start
+
+    for status in statuses:
+        if not status.existed:
+            state = "not built" if args.check else "written"
+        elif status.changed:
+            state = "out of date" if args.check else "written"
+        else:
+            state = "unchanged"
+        print(f"{state:12} {status.format:8} {status.size:>10,} bytes  {os.path.relpath(status.path)}")
+    print(f"Done in {elapsed:.2f}s")
+
+    # Outputs that were never built (the compiled ones under build/) do not fail the check
+    if args.check and any(status.changed and status.existed for status in statuses):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,111 @@
 #!/usr/bin/env python3
 """
 Build release versions for all platforms
+
+Platform builds run as a task graph: tasks whose dependencies are done run
+concurrently, each line of output is streamed with its task's name, and a
+task whose inputs are unchanged since its last successful run is skipped
+(see build/release_stamps.json; --force runs everything).
+
+The web package is built incrementally: each file's compressed form is cached
+under build/web_release by content hash and reused while the file is
+unchanged, and a run whose files all match the last package reuses that zip.
 """
 
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
 import os
+import struct
 import subprocess
 import shutil
+import sys
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
+try:
+    import brotli
+except ImportError:  # only the gzip variant is written
+    brotli = None
+
+WEB_DIR = "../PinYin_Web"
+RELEASES_DIR = "releases"
+
+# Files of PinYin_Web that are only used to build it, never served
+WEB_EXCLUDE = [
+    "add_*.py",
+    "generate_icon.py",
+    "pinyin_map_original.json",
+    "pinyin_map_backup.json",
+    # Written next to pinyin_map.json by patch_pinyin_map.py and build_dictionary.py;
+    # index.html and sw.js only fetch pinyin_map.json
+    "pinyin_map.overlay.jsonl",
+    "pinyin_map.min.json",
+    "*.tmp",
+    "__pycache__",
+    ".DS_Store",
+]
+
+# Served files that also get pre-compressed copies (name.gz, name.br) for static hosting
+WEB_PRECOMPRESSED = ["pinyin_map.json"]
+
+WEB_CACHE_DIR = os.path.join("build", "web_release")
+WEB_MANIFEST = os.path.join(WEB_CACHE_DIR, "manifest.json")
+
+ZIP_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+ZIP_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+ZIP_END = struct.Struct("<IHHHHIIH")
+ZIP_UTF8_FLAG = 0x800
+
+RELEASE_STAMPS = os.path.join("build", "release_stamps.json")
+
+# Directories that hold build outputs or IDE state, not task inputs
+UNTRACKED_DIRS = {"build", ".gradle", ".idea", "__pycache__", "xcuserdata"}
+
+_log_lock = threading.Lock()
+_current = threading.local()
+
+def log(message=""):
+    """Print a line prefixed with the running task's name; safe to call from any task"""
+    name = getattr(_current, "task", None)
+    prefix = f"[{name}] " if name else ""
+    with _log_lock:
+        for line in str(message).split("\n"):
+            print(f"{prefix}{line}", flush=True)
+
 def run_command(command, cwd=None):
-    """Run a command and return the result"""
-    print(f"Running: {command}")
-    result = subprocess.run(command, shell=True, cwd=cwd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+    """Run a command (an argument list), streaming its output as it is produced; True on success"""
+    log(f"Running: {' '.join(command)}")
+    try:
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1)
+    except OSError as e:
+        log(f"Error: {e}")
+        return False
+    with process:
+        for line in process.stdout:
+            log(line.rstrip("\n"))
+    if process.returncode != 0:
+        log(f"Error: {' '.join(command)} exited with status {process.returncode}")
         return False
-    print(f"Success: {result.stdout}")
     return True
 
 def build_android_release():
     """Build Android release APK"""
-    print("\n=== Building Android Release ===")
+    log("=== Building Android Release ===")
     
     android_dir = "../PinYin_Android"
     
     # Clean previous builds
-    if run_command("./gradlew clean", cwd=android_dir):
+    if run_command(["./gradlew", "clean"], cwd=android_dir):
         # Build release APK
-        if run_command("./gradlew assembleRelease", cwd=android_dir):
+        if run_command(["./gradlew", "assembleRelease"], cwd=android_dir):
             # Copy APK to releases directory
             apk_source = os.path.join(android_dir, "app/build/outputs/apk/release/app-release.apk")
             releases_dir = "releases"
@@ -39,22 +116,22 @@ def build_android_release():
             
             if os.path.exists(apk_source):
                 shutil.copy2(apk_source, apk_dest)
-                print(f"Android APK created: {apk_dest}")
-                return True
+                log(f"Android APK created: {apk_dest}")
+                return apk_dest
             else:
-                print("Error: APK file not found")
+                log("Error: APK file not found")
                 return False
     return False
 
 def build_ios_release():
     """Build iOS release (requires Xcode)"""
-    print("\n=== Building iOS Release ===")
-    print("Note: iOS release requires Xcode and Apple Developer account")
-    print("To build iOS release:")
-    print("1. Open PinYin_iOS.xcodeproj in Xcode")
-    print("2. Select 'Any iOS Device' as target")
-    print("3. Product -> Archive")
-    print("4. Distribute App through App Store Connect")
+    log("=== Building iOS Release ===")
+    log("Note: iOS release requires Xcode and Apple Developer account")
+    log("To build iOS release:")
+    log("1. Open PinYin_iOS.xcodeproj in Xcode")
+    log("2. Select 'Any iOS Device' as target")
+    log("3. Product -> Archive")
+    log("4. Distribute App through App Store Connect")
     
     # Create iOS build instructions
     ios_dir = "../PinYin_iOS"
@@ -92,29 +169,144 @@ def build_ios_release():
 pinyin, chinese, converter, language, learning, 拼音, 中文
 """)
     
-    print(f"iOS build instructions created: {instructions_file}")
-    return True
+    log(f"iOS build instructions created: {instructions_file}")
+    return instructions_file
+
+def web_release_files(web_dir=WEB_DIR):
+    """(arcname, path) of every served file in the web app, in a stable order"""
+    files = []
+    for root, dirs, names in os.walk(web_dir):
+        dirs[:] = sorted(d for d in dirs if not _excluded(d))
+        for name in sorted(names):
+            if not _excluded(name):
+                path = os.path.join(root, name)
+                files.append((os.path.relpath(path, web_dir).replace(os.sep, "/"), path))
+    return files
+
+def _excluded(name):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in WEB_EXCLUDE)
+
+def _zip_member(arcname, data, date_time, kind):
+    """Compressed member cached under its content hash; kind is "deflate", "gz" or "br"
+
+    Returns (arcname, method, crc, size, blob path, date_time). deflate blobs
+    are raw DEFLATE streams written into the zip as is; gz and br blobs are
+    already compressed and stored.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    blob = os.path.join(WEB_CACHE_DIR, "members", f"{digest}.{kind}")
+    reused = os.path.exists(blob)
+    if not reused:
+        if kind == "deflate":
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+        elif kind == "gz":
+            payload = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            payload = brotli.compress(data, quality=11)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_path = f"{blob}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, blob)
+        data = payload if kind != "deflate" else data
+    elif kind != "deflate":
+        with open(blob, "rb") as f:
+            data = f.read()
+
+    if kind == "deflate":
+        member = (arcname, zipfile.ZIP_DEFLATED)
+    else:
+        member = (f"{arcname}.{kind}", zipfile.ZIP_STORED)
+    return member + (zlib.crc32(data), len(data), blob, date_time), digest, reused
+
+def write_zip(path, members):
+    """Write a zip of already-compressed members, copying each blob without recompressing it"""
+    central = []
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as out:
+        for arcname, method, crc, size, blob, date_time in members:
+            name = arcname.encode("utf-8")
+            dos_time = date_time[3] << 11 | date_time[4] << 5 | date_time[5] // 2
+            dos_date = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+            compressed_size = os.path.getsize(blob)
+            offset = out.tell()
+            out.write(ZIP_LOCAL_HEADER.pack(0x04034B50, 20, ZIP_UTF8_FLAG, method, dos_time, dos_date,
+                                            crc, compressed_size, size, len(name), 0))
+            out.write(name)
+            with open(blob, "rb") as f:
+                shutil.copyfileobj(f, out)
+            central.append(ZIP_CENTRAL_HEADER.pack(0x02014B50, 3 << 8 | 20, 20, ZIP_UTF8_FLAG, method,
+                                                   dos_time, dos_date, crc, compressed_size, size,
+                                                   len(name), 0, 0, 0, 0, 0o100644 << 16, offset) + name)
+        central_offset = out.tell()
+        out.write(b"".join(central))
+        out.write(ZIP_END.pack(0x06054B50, 0, 0, len(central), len(central),
+                               out.tell() - central_offset, central_offset, 0))
+    os.replace(tmp_path, path)
+
+def load_web_manifest():
+    try:
+        with open(WEB_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def package_web_release(web_dir=WEB_DIR, releases_dir=RELEASES_DIR):
+    """Package the served web files into a release zip, reusing cached compressed members
+
+    Returns (zip path, members reused, members compressed); compressed is
+    None when every file matched the last package and its zip was reused.
+    """
+    os.makedirs(releases_dir, exist_ok=True)
+    previous = load_web_manifest()
+    members, hashes = [], {}
+    reused_count = compressed_count = 0
+    for arcname, path in web_release_files(web_dir):
+        with open(path, "rb") as f:
+            data = f.read()
+        date_time = time.localtime(max(os.path.getmtime(path), 315532800))[:6]
+        kinds = ["deflate"]
+        if arcname in WEB_PRECOMPRESSED:
+            kinds += ["gz"] + (["br"] if brotli is not None else [])
+        for kind in kinds:
+            member, digest, reused = _zip_member(arcname, data, date_time, kind)
+            members.append(member)
+            hashes[member[0]] = digest
+            reused_count += reused
+            compressed_count += not reused
+
+    package_digest = hashlib.sha256(json.dumps(hashes, sort_keys=True).encode("utf-8")).hexdigest()
+    if previous.get("digest") == package_digest and os.path.exists(previous.get("package", "")):
+        return previous["package"], len(members), None
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    web_zip = os.path.join(releases_dir, f"PinYin_Web_v1.0.0_{timestamp}.zip")
+    write_zip(web_zip, members)
+
+    # Drop cached blobs no member refers to any more
+    blobs = {os.path.basename(member[4]) for member in members}
+    for name in os.listdir(os.path.join(WEB_CACHE_DIR, "members")):
+        if name not in blobs and not name.endswith(".tmp"):
+            os.remove(os.path.join(WEB_CACHE_DIR, "members", name))
+
+    with open(WEB_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"package": web_zip, "digest": package_digest, "members": hashes}, f, indent=2)
+    return web_zip, reused_count, compressed_count
 
 def build_web_release():
     """Build Web release"""
-    print("\n=== Building Web Release ===")
+    log("=== Building Web Release ===")
     
-    web_dir = "../PinYin_Web"
-    releases_dir = "releases"
+    releases_dir = RELEASES_DIR
     os.makedirs(releases_dir, exist_ok=True)
     
     # Create web release package
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    web_zip = os.path.join(releases_dir, f"PinYin_Web_v1.0.0_{timestamp}.zip")
-    
-    with zipfile.ZipFile(web_zip, 'w') as zipf:
-        for root, dirs, files in os.walk(web_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, web_dir)
-                zipf.write(file_path, arcname)
-    
-    print(f"Web release created: {web_zip}")
+    web_zip, reused, compressed = package_web_release(WEB_DIR, releases_dir)
+    if compressed is None:
+        log(f"Web release unchanged: {web_zip}")
+    else:
+        log(f"Web release created: {web_zip} ({reused} members reused, {compressed} compressed)")
     
     # Create deployment instructions
     deploy_file = os.path.join(releases_dir, "WEB_DEPLOYMENT.md")
@@ -146,7 +338,7 @@ def build_web_release():
 - index.html
 - manifest.json
 - sw.js
-- pinyin_map.json
+- pinyin_map.json (plus pinyin_map.json.gz / .br for servers that serve pre-compressed files)
 - privacy_policy.html
 - icons/ (all icon files)
 
@@ -156,12 +348,12 @@ def build_web_release():
 - App-like experience
 """)
     
-    print(f"Web deployment instructions created: {deploy_file}")
-    return True
+    log(f"Web deployment instructions created: {deploy_file}")
+    return web_zip
 
 def create_release_summary():
     """Create a summary of all releases"""
-    print("\n=== Creating Release Summary ===")
+    log("=== Creating Release Summary ===")
     
     releases_dir = "releases"
     summary_file = os.path.join(releases_dir, "RELEASE_SUMMARY.md")
@@ -205,31 +397,149 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 For support or questions, contact through app stores.
 """)
     
-    print(f"Release summary created: {summary_file}")
+    log(f"Release summary created: {summary_file}")
+    return summary_file
+
+class BuildTask:
+    """One step of the release build
+
+    action returns the path it produced, or a false value on failure. A task
+    with inputs (files or directories) is skipped when their fingerprint
+    matches its last successful run and that run's output still exists; a
+    task without inputs always runs.
+    """
+
+    def __init__(self, name, action, deps=(), inputs=()):
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+
+def fingerprint(paths):
+    """Hash of the path, size and modification time of every file under paths"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = []
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in UNTRACKED_DIRS)
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        for file in files:
+            stat = os.stat(file)
+            digest.update(f"{os.path.relpath(file)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def load_stamps():
+    try:
+        with open(RELEASE_STAMPS, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_stamps(stamps):
+    os.makedirs(os.path.dirname(RELEASE_STAMPS), exist_ok=True)
+    tmp_path = f"{RELEASE_STAMPS}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stamps, f, indent=2)
+    os.replace(tmp_path, RELEASE_STAMPS)
+
+def release_tasks():
+    """The release build's task graph"""
+    script = os.path.abspath(__file__)
+    return [
+        BuildTask("android", build_android_release, inputs=["../PinYin_Android", script]),
+        BuildTask("ios", build_ios_release, inputs=[script]),
+        BuildTask("web", build_web_release, inputs=[WEB_DIR, script]),
+        # Runs after the platforms whether or not they succeeded, as the summary always has
+        BuildTask("summary", create_release_summary, deps=["android", "ios", "web"]),
+    ]
+
+def _run_task(task, stamps, force):
+    """Run one task in a worker thread; returns (status, output, seconds)"""
+    _current.task = task.name
+    started = time.perf_counter()
+    try:
+        inputs = fingerprint(task.inputs) if task.inputs else None
+        stamp = stamps.get(task.name)
+        if (not force and inputs is not None and stamp and stamp["inputs"] == inputs
+                and os.path.exists(stamp["output"])):
+            log(f"Up to date: {stamp['output']}")
+            return "skipped", stamp["output"], time.perf_counter() - started
+        try:
+            output = task.action()
+        except Exception as e:
+            log(f"Error: {e!r}")
+            output = None
+        if not output:
+            return "failed", None, time.perf_counter() - started
+        if inputs is not None:
+            stamps[task.name] = {"inputs": inputs, "output": output}
+        return "done", output, time.perf_counter() - started
+    finally:
+        _current.task = None
+
+def run_tasks(tasks, jobs=None, force=False):
+    """Run a task graph, starting each task as soon as its dependencies have finished
+
+    Returns {name: (status, output, seconds)}, status being "done",
+    "skipped" or "failed". Stamps of successful tasks are saved at the end.
+    """
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        unknown = [dep for dep in task.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Task {task.name!r} depends on unknown tasks: {', '.join(unknown)}")
+
+    stamps = load_stamps()
+    results = {}
+    pending = list(tasks)
+    running = {}
+    with ThreadPoolExecutor(jobs or len(tasks)) as executor:
+        while pending or running:
+            ready = [task for task in pending if all(dep in results for dep in task.deps)]
+            if not ready and not running:
+                raise ValueError(f"Dependency cycle among tasks: {', '.join(task.name for task in pending)}")
+            for task in ready:
+                pending.remove(task)
+                running[executor.submit(_run_task, task, stamps, force)] = task
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                results[task.name] = future.result()
+                status, _, seconds = results[task.name]
+                log(f"{task.name}: {status} in {seconds:.1f}s")
+    save_stamps(stamps)
+    return results
 
 def main():
     """Main build process"""
+    parser = argparse.ArgumentParser(description="Build release versions for all platforms")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="tasks run at once (default: every ready task)")
+    parser.add_argument("-f", "--force", action="store_true", help="run every task even if its inputs are unchanged")
+    args = parser.parse_args()
+
     print("=== PinYin App Release Build ===")
     
     # Create releases directory
-    releases_dir = "releases"
+    releases_dir = RELEASES_DIR
     os.makedirs(releases_dir, exist_ok=True)
     
     # Build all platforms
-    android_success = build_android_release()
-    ios_success = build_ios_release()
-    web_success = build_web_release()
-    
-    # Create summary
-    create_release_summary()
+    started = time.perf_counter()
+    results = run_tasks(release_tasks(), args.jobs, args.force)
+    succeeded = {name: status != "failed" for name, (status, _, _) in results.items()}
     
     print("\n=== Build Complete ===")
     print(f"Releases directory: {os.path.abspath(releases_dir)}")
-    print(f"Android: {'✓' if android_success else '✗'}")
-    print(f"iOS: {'✓' if ios_success else '✗'}")
-    print(f"Web: {'✓' if web_success else '✗'}")
+    for name, label in [("android", "Android"), ("ios", "iOS"), ("web", "Web"), ("summary", "Summary")]:
+        status, _, seconds = results[name]
+        print(f"{label}: {'✓' if succeeded[name] else '✗'} {status} ({seconds:.1f}s)")
+    print(f"Total: {time.perf_counter() - started:.1f}s")
     
-    if android_success and web_success:
+    if succeeded["android"] and succeeded["web"]:
         print("\n✅ Ready for release!")
         print("Next steps:")
         print("1. Test the APK on real devices")
@@ -238,6 +548,7 @@ def main():
         print("4. Build iOS version in Xcode")
     else:
         print("\n❌ Some builds failed. Check errors above.")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
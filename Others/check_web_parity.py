@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Check the Python engine against the web app's converter
+
+fixtures/web_parity.jsonl holds input lines with the output that
+convertToPinyinWithDetails (and convertPinyinToNumber) in
+PinYin_Web/index.html gives for them. The check converts every line with
+each dictionary backend and reports any difference:
+
+    python3 check_web_parity.py
+    python3 check_web_parity.py --backend binary --show 5
+
+After the web map or index.html changes, regenerate the expected outputs
+by running the JavaScript itself (needs node):
+
+    python3 check_web_parity.py --regenerate
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from pinyin_engine import (
+    Converter,
+    ShardedDictionary,
+    ensure_binary_dictionary,
+    ensure_sharded_dictionary,
+    load_dictionary,
+    load_pinyin_map,
+    open_shared_dictionary,
+)
+from pinyin_engine.dictionary import DEFAULT_MAP_PATH, PROJECT_ROOT
+
+INDEX_HTML = PROJECT_ROOT / "PinYin_Web" / "index.html"
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "web_parity.jsonl"
+
+# Functions of index.html the fixture is generated with
+WEB_FUNCTIONS = ("convertToPinyinWithDetails", "convertPinyinToNumber", "convertSingleSyllable")
+
+BACKENDS = ("memory", "binary", "shards", "numpy")
+
+CASE_COUNT = 400
+
+NODE_SCRIPT = """
+const fs = require("fs");
+console.log = () => {};
+const pinyinMap = JSON.parse(fs.readFileSync(process.argv[1], "utf8"));
+%s
+for (const line of fs.readFileSync(0, "utf8").split("\\n")) {
+    if (!line) continue;
+    const text = JSON.parse(line);
+    const { result, detailText } = convertToPinyinWithDetails(text);
+    const number = convertPinyinToNumber(result);
+    process.stdout.write(JSON.stringify({ text, result, detail: detailText, number }) + "\\n");
+}
+"""
+
+
+def extract_function(source: str, name: str) -> str:
+    """Source of one top-level function of index.html, by brace matching"""
+    start = source.index(f"function {name}(")
+    depth = 0
+    for end in range(source.index("{", start), len(source)):
+        if source[end] == "{":
+            depth += 1
+        elif source[end] == "}":
+            depth -= 1
+            if depth == 0:
+                return source[start:end + 1]
+    raise ValueError(f"Unterminated function {name} in {INDEX_HTML}")
+
+
+def sample_texts(pinyin_map, count: int = CASE_COUNT, seed: int = 0):
+    """Mixed input lines: words, multi-reading characters, unknown characters, Latin text and punctuation"""
+    rng = random.Random(seed)
+    words = sorted(key for key in pinyin_map if len(key) > 1)
+    chars = sorted(key for key in pinyin_map if len(key) == 1)
+    multi = [key for key in chars if len(pinyin_map[key]) > 1]
+    unknown = [chr(cp) for cp in range(0x4E00, 0xA000) if chr(cp) not in pinyin_map][:200]
+    other = ["，", "。", "！", "？", " ", "abc", "Hello", "123", "-", "\t", "「", "」", "ー", "あ"]
+    pools = [words, words, chars, multi, unknown, other]
+    texts = []
+    for _ in range(count):
+        length = rng.randint(1, 16)
+        texts.append("".join(rng.choice(rng.choice(pools)) for _ in range(length)))
+    return texts
+
+
+def regenerate(path: Path = FIXTURE_PATH, map_path: Path = DEFAULT_MAP_PATH) -> int:
+    """Run the web app's JavaScript over the sample inputs and write the fixture"""
+    html = INDEX_HTML.read_text(encoding="utf-8")
+    script = NODE_SCRIPT % "\n".join(extract_function(html, name) for name in WEB_FUNCTIONS)
+    texts = sample_texts(load_pinyin_map(map_path))
+    lines = "".join(json.dumps(text, ensure_ascii=False) + "\n" for text in texts)
+    output = subprocess.run(["node", "-e", script, str(map_path)], input=lines, capture_output=True,
+                            text=True, encoding="utf-8", check=True).stdout
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for line in output.splitlines():
+            f.write(json.dumps(json.loads(line), ensure_ascii=False) + "\n")
+    return len(texts)
+
+
+def load_cases(path: Path = FIXTURE_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def converters(backends):
+    """(name, convert(texts, tone) -> [(result, detail)]) for each requested backend"""
+    for backend in backends:
+        if backend == "numpy":
+            try:
+                from pinyin_engine.vectorized import VectorizedConverter
+            except ImportError:
+                print("numpy: skipped (numpy is not installed)")
+                continue
+            vectorized = VectorizedConverter(load_dictionary())
+            yield backend, lambda texts, tone, v=vectorized: v.convert_batch(texts, tone, details=True)
+            continue
+        if backend == "memory":
+            pinyin_map = load_dictionary()
+        elif backend == "binary":
+            pinyin_map = open_shared_dictionary(ensure_binary_dictionary())
+        else:
+            pinyin_map = ShardedDictionary(ensure_sharded_dictionary())
+        converter = Converter(pinyin_map)
+        yield backend, lambda texts, tone, c=converter: [c.convert_with_details(text, tone) for text in texts]
+
+
+def check(cases, backends, show: int = 0) -> int:
+    """Compare every backend with the fixture, returning the number of mismatches"""
+    texts = [case["text"] for case in cases]
+    failures = 0
+    for name, convert in converters(backends):
+        mismatches = []
+        marked = convert(texts, "mark")
+        numbered = convert(texts, "number")
+        for case, (result, detail), (number, _) in zip(cases, marked, numbered):
+            expected = (case["result"], case["detail"], case["number"])
+            if (result, detail, number) != expected:
+                mismatches.append((case["text"], expected, (result, detail, number)))
+        print(f"{name}: {len(cases) - len(mismatches)}/{len(cases)} match")
+        for text, expected, actual in mismatches[:show]:
+            print(f"  {text!r}\n    web:    {expected}\n    python: {actual}")
+        failures += len(mismatches)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the Python engine against the web app's converter")
+    parser.add_argument("-b", "--backend", action="append", choices=BACKENDS,
+                        help="dictionary backend to check, repeatable (default: all)")
+    parser.add_argument("-s", "--show", type=int, default=3, help="mismatches to print per backend")
+    parser.add_argument("--regenerate", action="store_true",
+                        help="rewrite the fixture by running index.html's JavaScript under node")
+    args = parser.parse_args()
+
+    if args.regenerate:
+        count = regenerate()
+        print(f"Wrote {count} cases to {FIXTURE_PATH}")
+    failures = check(load_cases(), args.backend or BACKENDS, args.show)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
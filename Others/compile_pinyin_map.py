@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compile pinyin_map.json into the binary dictionary used by pinyin_engine workers
+"""
+
+import argparse
+import os
+import time
+
+from pinyin_engine.binary import DEFAULT_BINARY_PATH, write_binary_dictionary
+from pinyin_engine.dictionary import DEFAULT_MAP_PATH, load_pinyin_map, source_identity
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("source", nargs="?", default=str(DEFAULT_MAP_PATH), help="pinyin_map.json to compile")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_BINARY_PATH), help="compiled dictionary path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pinyin_map = load_pinyin_map(args.source)
+    size = write_binary_dictionary(pinyin_map, args.output, source_identity(args.source))
+    elapsed = time.perf_counter() - start
+
+    print(f"Compiled {len(pinyin_map)} entries: {args.source} ({os.path.getsize(args.source):,} bytes)")
+    print(f"  -> {args.output} ({size:,} bytes) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compare pinyin_map variants, or merge them under an explicit precedence
+
+Examples:
+    python3 diff_pinyin_maps.py diff
+    python3 diff_pinyin_maps.py diff ../PinYin_Web/pinyin_map.json ../PinYin_Android/app/src/main/assets/pinyin_map.json --list
+    python3 diff_pinyin_maps.py merge -o merged.json --policy union \\
+        ../PinYin_Web/pinyin_map.json ../PinYin_Android/app/src/main/assets/pinyin_map_backup.json
+
+diff compares every map with the first one (default: all pinyin_map*.json
+variants of the three apps). merge takes maps highest precedence first.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from pinyin_engine.dictionary import PROJECT_ROOT
+from pinyin_engine.mapdiff import MERGE_POLICIES, diff_maps, find_map_files, merge_maps, write_map
+
+
+def show_path(path) -> str:
+    return os.path.relpath(path, PROJECT_ROOT)
+
+
+def format_readings(readings) -> str:
+    return "-" if readings is None else ", ".join(readings)
+
+
+def run_diff(args):
+    paths = args.maps or [str(path) for path in find_map_files()]
+    summaries, changes = diff_maps(paths)
+
+    if args.format == "json":
+        report = {
+            "base": show_path(summaries[0].path),
+            "maps": [
+                {
+                    "path": show_path(summary.path),
+                    "entries": summary.entries,
+                    "added": summary.added,
+                    "removed": summary.removed,
+                    "changed": summary.changed,
+                    **({"changes": [
+                        {"key": change.key, "kind": change.kind,
+                         "old": list(change.old) if change.old else None,
+                         "new": list(change.new) if change.new else None}
+                        for change in changes[summary.path]
+                    ]} if args.list and summary.path in changes else {}),
+                }
+                for summary in summaries
+            ],
+        }
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"Base: {show_path(summaries[0].path)} ({summaries[0].entries} entries)")
+    for summary in summaries[1:]:
+        print(f"{show_path(summary.path)}: {summary.entries} entries, "
+              f"+{summary.added} -{summary.removed} ~{summary.changed}")
+        if args.list:
+            for change in changes[summary.path]:
+                print(f"  {change.kind:8} {change.key}\t{format_readings(change.old)} -> {format_readings(change.new)}")
+
+
+def run_merge(args):
+    count = write_map(merge_maps(args.maps, args.policy), args.output)
+    print(f"Merged {len(args.maps)} maps ({args.policy}) into {args.output}: {count} entries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff or merge pinyin_map.json variants")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    diff = subparsers.add_parser("diff", help="compare maps against the first one")
+    diff.add_argument("maps", nargs="*", help="map files, base first (default: every app variant)")
+    diff.add_argument("-l", "--list", action="store_true", help="list every added/removed/changed key")
+    diff.add_argument("-f", "--format", choices=("text", "json"), default="text", help="report format")
+
+    merge = subparsers.add_parser("merge", help="merge maps, highest precedence first")
+    merge.add_argument("maps", nargs="+", help="map files, highest precedence first")
+    merge.add_argument("-o", "--output", required=True, help="merged pinyin_map.json to write")
+    merge.add_argument("-p", "--policy", choices=MERGE_POLICIES, default="first",
+                       help="first: take the highest-precedence entry; union: also append other maps' readings")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "diff":
+            run_diff(args)
+        else:
+            run_merge(args)
+    except BrokenPipeError:
+        sys.stderr.close()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,25 @@ Creates multiple icon designs for the PinYin app
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import argparse
+import multiprocessing
 import os
 
+try:
+    import numpy as np
+except ImportError:  # gradients fall back to one rectangle per row
+    np = None
+
+# Pixel sizes of each platform's icon set
+ICON_SIZES = {
+    "android": [48, 72, 96, 144, 192],
+    "ios": [20, 29, 40, 58, 60, 76, 80, 87, 120, 152, 167, 180, 1024],
+    "web": [16, 32, 48, 72, 96, 144, 192, 512],
+}
+
+# Smallest size designs are rendered at; every other size is resampled from it
+MASTER_SIZE = 512
+
 def get_chinese_font(size):
     """Get a font that supports Chinese characters"""
     # Try different font paths that support Chinese characters
@@ -28,20 +45,29 @@ def get_chinese_font(size):
     # If no Chinese font found, use default
     return ImageFont.load_default()
 
+def vertical_gradient(size, top, delta):
+    """Opaque size x size image whose row y is int(top + (y / size) * delta) per channel"""
+    if np is None:
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        for y in range(size):
+            fill = tuple(int(t + (y / size) * d) for t, d in zip(top, delta)) + (255,)
+            draw.rectangle([0, y, size, y+1], fill=fill)
+        return img
+
+    # One row per y, truncated like int(); broadcast across the width in one go
+    rows = np.trunc(np.array(top) + (np.arange(size) / size)[:, None] * np.array(delta))
+    pixels = np.empty((size, size, 4), dtype=np.uint8)
+    pixels[:, :, :3] = rows.astype(np.uint8)[:, None, :]
+    pixels[:, :, 3] = 255
+    return Image.fromarray(pixels, 'RGBA')
+
 def create_icon_design_1(size=512):
     """Design 1: Modern gradient with Pinyin text"""
-    # Create base image with gradient
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    # Blue to purple gradient background
+    img = vertical_gradient(size, (25, 118, 210), (30, 40, 45))
     draw = ImageDraw.Draw(img)
     
-    # Create gradient background
-    for y in range(size):
-        # Blue to purple gradient
-        r = int(25 + (y / size) * 30)
-        g = int(118 + (y / size) * 40)
-        b = int(210 + (y / size) * 45)
-        draw.rectangle([0, y, size, y+1], fill=(r, g, b, 255))
-    
     # Add white circle in center
     circle_center = size // 2
     circle_radius = size // 3
@@ -125,15 +151,9 @@ def create_icon_design_2(size=512):
 
 def create_icon_design_3(size=512):
     """Design 3: Chinese character with modern style"""
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
     # Gradient background
-    for y in range(size):
-        r = int(255 - (y / size) * 100)
-        g = int(255 - (y / size) * 150)
-        b = int(255 - (y / size) * 200)
-        draw.rectangle([0, y, size, y+1], fill=(r, g, b, 255))
+    img = vertical_gradient(size, (255, 255, 255), (-100, -150, -200))
+    draw = ImageDraw.Draw(img)
     
     # Add decorative elements
     # Top left corner
@@ -251,31 +271,71 @@ def create_chinese_style_icon(size=512):
     
     return img
 
-def save_icon(img, filename, size=512):
-    """Save icon with proper format"""
-    # Ensure the icons directory exists
+DESIGNS = {
+    "design_1": create_icon_design_1,
+    "design_2": create_icon_design_2,
+    "design_3": create_icon_design_3,
+    "design_4": create_icon_design_4,
+    "chinese_style": create_chinese_style_icon,
+}
+
+def save_design(task):
+    """Render one design at the master size and save every size resampled from it"""
+    design, master_size, sizes = task
+    master = DESIGNS[design](master_size)
+    paths = []
+    for size in sizes:
+        img = master if size == master_size else master.resize((size, size), Image.Resampling.LANCZOS)
+        path = f"icons/{design}_{size}x{size}.png"
+        img.save(path, "PNG")
+        paths.append(path)
+    return paths
+
+def generate_icons(designs, sizes, workers=None):
+    """Save every size of each design, one process pool task per design
+
+    Each task renders its design's master once and resamples the other sizes
+    from it. Returns the paths written.
+    """
     os.makedirs("icons", exist_ok=True)
-    
-    # Save full size
-    img.save(f"icons/{filename}_{size}x{size}.png", "PNG")
-    
-    # Save different sizes for Android
-    sizes = [48, 72, 96, 144, 192]
-    for s in sizes:
-        resized = img.resize((s, s), Image.Resampling.LANCZOS)
-        resized.save(f"icons/{filename}_{s}x{s}.png", "PNG")
+    master_size = max([MASTER_SIZE, *sizes])
+    sizes = sorted({master_size, *sizes}, reverse=True)
+    tasks = [(design, master_size, sizes) for design in designs]
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        results = [save_design(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(save_design, tasks, chunksize=1)
+    return [path for paths in results for path in paths]
 
 def main():
-    """Generate all icon designs"""
+    """Generate icon designs for the selected platforms"""
+    parser = argparse.ArgumentParser(description="Generate PinYin app icons")
+    parser.add_argument("-d", "--design", action="append", choices=[*DESIGNS, "all"],
+                        help="design to render, repeatable (default: chinese_style)")
+    parser.add_argument("-p", "--platform", action="append", choices=[*ICON_SIZES, "all"],
+                        help="icon set to produce, repeatable (default: android)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    designs = args.design or ["chinese_style"]
+    if "all" in designs:
+        designs = list(DESIGNS)
+    platforms = args.platform or ["android"]
+    if "all" in platforms:
+        platforms = list(ICON_SIZES)
+    sizes = {size for platform in platforms for size in ICON_SIZES[platform]}
+
     print("🎨 Generating PinYin app icons...")
-    
-    # Generate Chinese style design
-    print("Creating Chinese style icon...")
-    chinese_icon = create_chinese_style_icon()
-    save_icon(chinese_icon, "chinese_style")
-    
-    print("✅ Chinese style icon generated successfully!")
-    print("📁 Icon saved in the 'icons' directory")
+    print(f"Designs: {', '.join(designs)}; platforms: {', '.join(platforms)}")
+    paths = generate_icons(designs, sizes, args.workers)
+
+    print(f"✅ {len(paths)} icons generated successfully!")
+    print("📁 Icons saved in the 'icons' directory")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 
+from pinyin_engine.jsonstream import iter_map_entries
+
 class RequirementsGenerator:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
@@ -111,11 +113,23 @@ class RequirementsGenerator:
                     pinyin_files.append({
                         "platform": platform,
                         "path": str(pinyin_file.relative_to(self.project_root)),
-                        "size": pinyin_file.stat().st_size
+                        "size": pinyin_file.stat().st_size,
+                        **self.count_pinyin_entries(pinyin_file)
                     })
         
         self.requirements["data_analysis"]["pinyin_files"] = pinyin_files
     
+    def count_pinyin_entries(self, pinyin_file: Path) -> Dict[str, int]:
+        """Count entries of a pinyin map, streaming it rather than loading it"""
+        counts = {"entries": 0, "words": 0, "multi_reading": 0}
+        for key, readings in iter_map_entries(pinyin_file):
+            counts["entries"] += 1
+            if len(key) > 1:
+                counts["words"] += 1
+            if len(readings) > 1:
+                counts["multi_reading"] += 1
+        return counts
+    
     def generate_markdown(self) -> str:
         """Generate markdown documentation"""
         md_content = f"""# PinYin Project Requirements Specification (Auto-Generated)
@@ -155,7 +169,9 @@ This document was automatically generated by analyzing the project structure.
         
         for pinyin_file in self.requirements["data_analysis"]["pinyin_files"]:
             size_kb = pinyin_file["size"] / 1024
-            md_content += f"- **{pinyin_file['platform']}**: {pinyin_file['path']} ({size_kb:.1f} KB)\n"
+            md_content += (f"- **{pinyin_file['platform']}**: {pinyin_file['path']} ({size_kb:.1f} KB, "
+                           f"{pinyin_file['entries']} entries, {pinyin_file['words']} words, "
+                           f"{pinyin_file['multi_reading']} with multiple readings)\n")
         
         md_content += f"""
 ## 4. Technical Specifications
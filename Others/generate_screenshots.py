@@ -1,13 +1,29 @@
 #!/usr/bin/env python3
 """
 Generate screenshots for app store listings
+
+Screenshots are rendered across a process pool. screenshots/manifest.json
+records a hash of each image's inputs (text, size, language, font), and an
+image whose inputs are unchanged since the last run is not rendered again.
 """
 
+import argparse
+import hashlib
 import os
 import json
+import multiprocessing
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 
+SCREENSHOTS_DIR = "screenshots"
+MANIFEST_NAME = "manifest.json"
+
+# Bump when create_screenshot's layout changes, so every image is redrawn
+RENDER_VERSION = 1
+
+FONT_NAME = "Arial.ttf"
+
 # App store screenshot dimensions
 SCREENSHOT_SIZES = {
     'android': {
@@ -43,6 +59,25 @@ LANGUAGES = {
     'pl': 'Polski'
 }
 
+@lru_cache(maxsize=None)
+def load_font(font_size):
+    """Screenshot font at one size, loaded once per process"""
+    try:
+        return ImageFont.truetype(FONT_NAME, font_size)
+    except OSError:
+        return ImageFont.load_default()
+
+def font_fingerprint():
+    """Identify the font file in use, so installing or replacing it invalidates the manifest"""
+    path = getattr(load_font(12), "path", None)
+    if not isinstance(path, str) or not os.path.exists(path):
+        return "default"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 def create_screenshot(text, output_path, size, language_name):
     """Create a screenshot with the given text and size"""
     # Create image
@@ -51,10 +86,7 @@ def create_screenshot(text, output_path, size, language_name):
     
     # Calculate font size based on image size
     font_size = min(size) // 20
-    try:
-        font = ImageFont.truetype("Arial.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
+    font = load_font(font_size)
     
     # Calculate text position (center)
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -69,10 +101,7 @@ def create_screenshot(text, output_path, size, language_name):
     
     # Add language indicator
     lang_font_size = min(size) // 40
-    try:
-        lang_font = ImageFont.truetype("Arial.ttf", lang_font_size)
-    except:
-        lang_font = ImageFont.load_default()
+    lang_font = load_font(lang_font_size)
     
     lang_bbox = draw.textbbox((0, 0), language_name, font=lang_font)
     lang_width = lang_bbox[2] - lang_bbox[0]
@@ -88,40 +117,77 @@ def create_screenshot(text, output_path, size, language_name):
     img.save(output_path, 'PNG')
     print(f"Created: {output_path}")
 
-def generate_screenshots():
-    """Generate screenshots for all platforms and languages"""
-    
+def screenshot_jobs(screenshots_dir=SCREENSHOTS_DIR):
+    """(text, output_path, size, language_name) for every platform, device and language"""
     # Sample Chinese text for conversion
     sample_text = "你好世界"
     pinyin_text = "nǐ hǎo shì jiè"
-    
-    # Create screenshots directory
-    screenshots_dir = "screenshots"
-    os.makedirs(screenshots_dir, exist_ok=True)
-    
-    # Generate for each platform
+
+    # Create text showing conversion
+    display_text = f"{sample_text}\n↓\n{pinyin_text}"
+
+    jobs = []
     for platform in ['android', 'ios']:
-        platform_dir = os.path.join(screenshots_dir, platform)
-        os.makedirs(platform_dir, exist_ok=True)
-        
         for device in ['phone', 'tablet']:
-            device_dir = os.path.join(platform_dir, device)
-            os.makedirs(device_dir, exist_ok=True)
-            
+            device_dir = os.path.join(screenshots_dir, platform, device)
             size = SCREENSHOT_SIZES[platform][device]
-            
-            # Generate for each language
             for lang_code, lang_name in LANGUAGES.items():
-                # Create screenshot with Chinese text
                 filename = f"pinyin_{lang_code}_{device}.png"
-                output_path = os.path.join(device_dir, filename)
-                
-                # Create text showing conversion
-                display_text = f"{sample_text}\n↓\n{pinyin_text}"
-                
-                create_screenshot(display_text, output_path, size, lang_name)
-    
-    print(f"\nScreenshots generated in '{screenshots_dir}' directory")
+                jobs.append((display_text, os.path.join(device_dir, filename), size, lang_name))
+    return jobs
+
+def input_hash(job, font_id):
+    """Content hash of everything that determines one screenshot's pixels"""
+    text, _, size, language_name = job
+    key = json.dumps([RENDER_VERSION, text, list(size), language_name, font_id], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def load_screenshot_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _render_job(job):
+    create_screenshot(*job)
+    return job[1]
+
+def generate_screenshots(screenshots_dir=SCREENSHOTS_DIR, workers=None, force=False):
+    """Generate screenshots for all platforms and languages, skipping unchanged ones
+
+    Returns (rendered, skipped) counts.
+    """
+    os.makedirs(screenshots_dir, exist_ok=True)
+    manifest_path = os.path.join(screenshots_dir, MANIFEST_NAME)
+    manifest = {} if force else load_screenshot_manifest(manifest_path)
+    font_id = font_fingerprint()
+
+    hashes = {}
+    pending = []
+    for job in screenshot_jobs(screenshots_dir):
+        name = os.path.relpath(job[1], screenshots_dir)
+        hashes[name] = input_hash(job, font_id)
+        if manifest.get(name) != hashes[name] or not os.path.exists(job[1]):
+            pending.append(job)
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        for job in pending:
+            _render_job(job)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for _ in pool.imap_unordered(_render_job, pending):
+                pass
+
+    # Written only after every image is saved, so an interrupted run redraws what it missed
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(hashes.items())), f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    skipped = len(hashes) - len(pending)
+    print(f"\n{len(pending)} screenshots rendered, {skipped} unchanged, in '{screenshots_dir}' directory")
     print("Structure:")
     print("screenshots/")
     print("├── android/")
@@ -131,5 +197,16 @@ def generate_screenshots():
     print("    ├── phone/")
     print("    └── tablet/")
 
+    return len(pending), skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate app store screenshots")
+    parser.add_argument("-o", "--output", default=SCREENSHOTS_DIR, help="screenshots directory")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-f", "--force", action="store_true", help="render every screenshot, ignoring the manifest")
+    args = parser.parse_args()
+    generate_screenshots(args.output, args.workers, args.force)
+
 if __name__ == "__main__":
-    generate_screenshots() 
\ No newline at end of file
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Record word/reading changes for a pinyin_map.json as an overlay, and compact them into the map
+
+Examples:
+    python3 patch_pinyin_map.py set ../PinYin_Web/pinyin_map.json words.json
+    python3 patch_pinyin_map.py add ../PinYin_Web/pinyin_map.json common_words.json
+    python3 patch_pinyin_map.py delete ../PinYin_Web/pinyin_map.json 谢谢
+    python3 patch_pinyin_map.py show ../PinYin_Web/pinyin_map.json
+    python3 patch_pinyin_map.py compact ../PinYin_Web/pinyin_map.json
+
+words.json holds {"word": ["reading", ...], ...}, like the dicts in the add_*.py scripts.
+"set" overwrites existing keys, "add" only fills in missing ones.
+
+The app maps are also built by build_dictionary.py, whose manifest reads the
+overlay next to each of them. Compacting one of those would drop its changes
+from the next build, so leave their overlay in place.
+"""
+
+import argparse
+import json
+
+from pinyin_engine.overlay import append_changes, compact, overlay_path_for, read_records, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patch a pinyin_map.json through its overlay file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for op in ("set", "add"):
+        sub = subparsers.add_parser(op, help=f"{op} readings from a JSON file of word -> readings")
+        sub.add_argument("map", help="pinyin_map.json to patch")
+        sub.add_argument("changes", help="JSON file of word -> readings")
+
+    delete = subparsers.add_parser("delete", help="delete keys")
+    delete.add_argument("map", help="pinyin_map.json to patch")
+    delete.add_argument("keys", nargs="+", help="keys to delete")
+
+    show = subparsers.add_parser("show", help="list pending overlay changes")
+    show.add_argument("map", help="pinyin_map.json")
+
+    compact_parser = subparsers.add_parser("compact", help="fold the overlay into the map")
+    compact_parser.add_argument("map", help="pinyin_map.json")
+
+    args = parser.parse_args()
+    overlay_path = overlay_path_for(args.map)
+
+    if args.command in ("set", "add"):
+        with open(args.changes, "r", encoding="utf-8") as f:
+            changes = json.load(f)
+        count = append_changes(overlay_path, changes, op=args.command)
+        print(f"Appended {count} {args.command} records to {overlay_path}")
+    elif args.command == "delete":
+        count = append_changes(overlay_path, {key: None for key in args.keys}, op="delete")
+        print(f"Appended {count} delete records to {overlay_path}")
+    elif args.command == "show":
+        # "add" records are shown as pending; whether they apply is decided against the map at load time
+        for key, readings in replay(read_records(overlay_path)).items():
+            print(f"{key}\t{'(deleted)' if readings is None else ', '.join(readings)}")
+    else:
+        changed = compact(args.map, overlay_path)
+        print(f"Compacted {changed} changed keys into {args.map}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Stream UTF-8 text through the pinyin converter, one line at a time
+
+Examples:
+    cat titles.txt | python3 pinyin_convert.py > titles.pinyin
+    python3 pinyin_convert.py --format jsonl --tone number --details a.txt b.txt
+    python3 pinyin_convert.py --backend numpy --chunksize 20000 -w 0 corpus.txt > corpus.pinyin
+"""
+
+import argparse
+import io
+import json
+import sys
+from itertools import tee
+from typing import Iterator, TextIO
+
+from pinyin_engine import TONE_STYLES, convert_many
+from pinyin_engine.batch import BACKENDS
+from pinyin_engine.binary import DEFAULT_BINARY_PATH
+from pinyin_engine.dictionary import DEFAULT_MAP_PATH
+from pinyin_engine.segment import SEGMENTATIONS
+
+FORMATS = ("plain", "jsonl", "tsv")
+
+
+def read_lines(paths) -> Iterator[str]:
+    """Yield input lines without their line endings, one file at a time"""
+    for path in paths:
+        if path == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+        else:
+            stream = open(path, "r", encoding="utf-8", errors="replace")
+        with stream:
+            for line in stream:
+                yield line.rstrip("\r\n")
+
+
+def format_record(text: str, converted, output_format: str, details: bool) -> str:
+    if details:
+        pinyin, detail_text = converted
+    else:
+        pinyin, detail_text = converted, ""
+
+    if output_format == "jsonl":
+        record = {"text": text, "pinyin": pinyin}
+        if details:
+            record["details"] = detail_text
+        return json.dumps(record, ensure_ascii=False)
+    if output_format == "tsv":
+        fields = [text, pinyin, detail_text] if details else [text, pinyin]
+        return "\t".join(field.replace("\t", " ") for field in fields)
+    return pinyin
+
+
+def write_results(lines: Iterator[str], out: TextIO, args):
+    # The tee buffer only holds the lines of chunks still being converted
+    texts, to_convert = tee(lines)
+    results = convert_many(
+        to_convert,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        tone=args.tone,
+        details=args.details,
+        cache_size=args.cache_size,
+        segmentation=args.segmentation,
+        backend=args.backend,
+        source=args.source,
+        dictionary_path=args.dictionary,
+    )
+    for text, converted in zip(texts, results):
+        out.write(format_record(text, converted, args.format, args.details))
+        out.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Chinese text to pinyin line by line")
+    parser.add_argument("files", nargs="*", default=["-"], help="input files (default: stdin)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="plain", help="output format")
+    parser.add_argument("-t", "--tone", choices=TONE_STYLES, default="mark", help="tone style")
+    parser.add_argument("-d", "--details", action="store_true", help="include alternative readings")
+    parser.add_argument("-s", "--segmentation", choices=SEGMENTATIONS, default="longest",
+                        help="greedy longest match (as in the web app) or most probable word path")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, default="python",
+                        help="per-line Python converter, or NumPy batches per chunk (needs numpy)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--cache-size", type=int, default=0, help="per-worker cache of repeated lines")
+    parser.add_argument("--chunksize", type=int, default=512, help="lines per worker task")
+    parser.add_argument("--source", default=str(DEFAULT_MAP_PATH), help="pinyin_map.json to convert with")
+    parser.add_argument("--dictionary", default=str(DEFAULT_BINARY_PATH), help="compiled dictionary path")
+    args = parser.parse_args()
+
+    if args.output:
+        out = open(args.output, "w", encoding="utf-8", newline="\n")
+    else:
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="\n", write_through=False)
+
+    try:
+        with out:
+            write_results(read_lines(args.files), out, args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head)
+        sys.stderr.close()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Python conversion engine for the PinYin apps
+
+Run from the Others/ directory:
+
+    from pinyin_engine import convert, convert_with_details
+
+    convert("银行家")               # 'yín háng jiā'
+    convert_with_details("行")      # ConversionResult(result='xíng', detail_text='行: xíng, háng')
+    convert("银行家", tone="number")  # 'yin2 hang2 jia1'
+    convert("我们", tone="zhuyin")     # 'wo3 men5' (neutral tone as 5, for zhuyin mapping)
+
+Overlapping words can be resolved by word frequency instead of greedily:
+
+    Converter(load_dictionary(), segmentation="dag")
+
+Workers can run on the compiled dictionary (see compile_pinyin_map.py) instead:
+
+    Converter(open_shared_dictionary())
+
+or on the dictionary sharded by Unicode block, parsing only the blocks the
+text actually uses:
+
+    Converter(ShardedDictionary(ensure_sharded_dictionary()))
+
+Large corpora go through a process pool, in input order:
+
+    for pinyin in convert_many(lines, workers=8):
+        ...
+
+With numpy installed, each chunk can instead be converted as one array batch:
+
+    convert_many(lines, workers=8, chunksize=20000, backend="numpy")
+"""
+
+from .batch import BACKENDS, convert_many
+from .binary import (
+    DEFAULT_BINARY_PATH,
+    BinaryDictionary,
+    ensure_binary_dictionary,
+    open_shared_dictionary,
+    write_binary_dictionary,
+)
+from .cache import CacheInfo
+from .dictionary import DEFAULT_MAP_PATH, PinyinDictionary, load_dictionary, load_pinyin_map
+from .engine import (
+    ConversionResult,
+    Converter,
+    convert,
+    convert_with_details,
+    get_default_converter,
+)
+from .formatting import TONE_STYLES, ToneForms
+from .jsonstream import iter_map_entries
+from .overlay import OverlayDictionary, append_changes, compact, read_overlay, with_overlay
+from .segment import SEGMENTATIONS, load_frequencies
+from .server import ConversionServer, MicroBatcher
+from .shards import DEFAULT_SHARDS_PATH, ShardedDictionary, ensure_sharded_dictionary, write_sharded_dictionary
+from .syllables import SyllableTable
+
+__all__ = [
+    "BACKENDS",
+    "DEFAULT_BINARY_PATH",
+    "DEFAULT_MAP_PATH",
+    "DEFAULT_SHARDS_PATH",
+    "BinaryDictionary",
+    "CacheInfo",
+    "ConversionResult",
+    "ConversionServer",
+    "Converter",
+    "MicroBatcher",
+    "OverlayDictionary",
+    "PinyinDictionary",
+    "SEGMENTATIONS",
+    "ShardedDictionary",
+    "SyllableTable",
+    "TONE_STYLES",
+    "ToneForms",
+    "append_changes",
+    "compact",
+    "convert",
+    "convert_many",
+    "convert_with_details",
+    "ensure_binary_dictionary",
+    "ensure_sharded_dictionary",
+    "get_default_converter",
+    "iter_map_entries",
+    "load_dictionary",
+    "load_frequencies",
+    "load_pinyin_map",
+    "open_shared_dictionary",
+    "read_overlay",
+    "with_overlay",
+    "write_binary_dictionary",
+    "write_sharded_dictionary",
+]
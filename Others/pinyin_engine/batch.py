@@ -0,0 +1,116 @@
+"""
+Bulk conversion over a process pool sharing one compiled dictionary
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .binary import DEFAULT_BINARY_PATH, ensure_binary_dictionary, open_shared_dictionary
+from .dictionary import DEFAULT_MAP_PATH
+from .engine import ConversionResult, Converter
+from .formatting import check_tone_style
+from .overlay import with_overlay
+from .segment import check_segmentation
+
+# Chunks in flight per worker; bounds memory while keeping every worker busy
+CHUNKS_PER_WORKER = 2
+
+# "numpy" converts each chunk as one array batch (see vectorized.py)
+BACKENDS = ("python", "numpy")
+
+_worker_converter = None
+_worker_options = ("mark", False, "python")
+
+
+def check_backend(backend: str, segmentation: str = "longest"):
+    """Raise ValueError for an unknown backend or one that lacks the segmentation"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if backend == "numpy" and segmentation != "longest":
+        raise ValueError("The numpy backend only supports longest-match segmentation")
+
+
+def _init_worker(source: Path, dictionary_path: Path, tone: str, details: bool, cache_size: int, segmentation: str,
+                 backend: str):
+    """Pool initializer: map the compiled dictionary once per worker"""
+    global _worker_converter, _worker_options
+    dictionary = with_overlay(open_shared_dictionary(dictionary_path), source)
+    if backend == "numpy":
+        from .vectorized import VectorizedConverter
+        _worker_converter = VectorizedConverter(dictionary)
+    else:
+        _worker_converter = Converter(dictionary, cache_size=cache_size, segmentation=segmentation)
+    _worker_options = (tone, details, backend)
+
+
+def _convert_chunk(texts: List[str]) -> list:
+    tone, details, backend = _worker_options
+    if backend == "numpy":
+        return _worker_converter.convert_batch(texts, tone, details)
+    if details:
+        return [_worker_converter.convert_with_details(text, tone) for text in texts]
+    return [_worker_converter.convert(text, tone) for text in texts]
+
+
+def _chunks(texts: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_many(texts: Iterable[str],
+                 workers: Optional[int] = None,
+                 chunksize: int = 256,
+                 tone: str = "mark",
+                 details: bool = False,
+                 cache_size: int = 0,
+                 segmentation: str = "longest",
+                 backend: str = "python",
+                 source: Union[str, Path] = DEFAULT_MAP_PATH,
+                 dictionary_path: Union[str, Path] = DEFAULT_BINARY_PATH) -> Iterator[Union[str, ConversionResult]]:
+    """Convert texts in input order, fanning chunks out across worker processes
+
+    Workers map the compiled dictionary (compiled from source first if it is
+    missing or stale, and read together with source's overlay) rather than
+    receiving a pickled copy, and only a
+    bounded number of chunks is in flight, so texts can be a lazy iterator
+    over an arbitrarily large corpus. Yields strings, or ConversionResults
+    when details is true. workers defaults to os.cpu_count(); workers=1
+    converts in this process. cache_size enables a per-worker result cache
+    for corpora with many repeated lines. segmentation is passed to each
+    worker's Converter. backend "numpy" converts each chunk as one NumPy
+    batch instead (same output; longest match only, no result cache), which
+    pays off with large chunks.
+    """
+    check_tone_style(tone)
+    check_segmentation(segmentation)
+    check_backend(backend, segmentation)
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    dictionary_path = ensure_binary_dictionary(source, dictionary_path)
+
+    if workers == 1:
+        _init_worker(source, dictionary_path, tone, details, cache_size, segmentation, backend)
+        for chunk in _chunks(texts, chunksize):
+            yield from _convert_chunk(chunk)
+        return
+
+    # Mapping before the pool starts lets forked workers inherit the mapping
+    open_shared_dictionary(dictionary_path)
+    initargs = (source, dictionary_path, tone, details, cache_size, segmentation, backend)
+    with multiprocessing.Pool(workers, _init_worker, initargs) as pool:
+        pending = deque()
+        for chunk in _chunks(texts, chunksize):
+            pending.append(pool.apply_async(_convert_chunk, (chunk,)))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
@@ -0,0 +1,407 @@
+"""
+Compact binary dictionary compiled from pinyin_map.json
+
+Layout (little-endian, every section 4-byte aligned):
+
+    header     magic, version, entry count, then (offset, size) of each section
+    syllables  string table of the distinct readings; a reading's index is its ID
+    ranges     (first code point, length, first slot) for each run of code points
+    slots      u16 per code point: reading ID, MULTI_FLAG | run index, or MISSING
+    runs       u32 count, u32 offsets[count + 1], then a u32 pool of reading IDs
+    words      string table of the sorted word keys, then u32 run index per word
+    spaced     u32 count, u32 offsets[count + 1], then a u32 pool of syllable IDs:
+               the syllables of each word's primary reading, in word order
+    source     string table of one JSON object: path and SHA-256 of the map
+               the file was compiled from ({} when compiled from memory)
+
+Only slots are 16-bit, so single-character readings are interned first and
+must stay below MULTI_FLAG; word readings may use the full u32 ID range.
+
+A string table is u32 count, u32 offsets[count + 1], then the UTF-8 bytes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .dictionary import DEFAULT_MAP_PATH, load_pinyin_map, source_identity
+from .spacing import word_syllables
+from .syllables import SyllableTable
+
+MAGIC = b"PYMB"
+VERSION = 4
+
+# Compiled artifacts are build outputs and are not checked in
+DEFAULT_BINARY_PATH = Path(__file__).resolve().parents[1] / "build" / "pinyin_map.bin"
+
+SECTIONS = ("syllables", "ranges", "slots", "runs", "words", "spaced", "source")
+HEADER = struct.Struct("<4sHHI" + "II" * len(SECTIONS))
+
+MISSING = 0xFFFF
+MULTI_FLAG = 0x8000
+
+# Code points further apart than this start a new range instead of padding slots
+MAX_RANGE_GAP = 32
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _pack_offsets(lengths: List[int]) -> bytes:
+    """Pack u32 count followed by u32 offsets[count + 1]"""
+    offsets = array("I", [len(lengths), 0])
+    for length in lengths:
+        offsets.append(offsets[-1] + length)
+    return _le_bytes(offsets)
+
+
+def _pack_strings(strings: List[str]) -> bytes:
+    encoded = [s.encode("utf-8") for s in strings]
+    return _pad(_pack_offsets([len(item) for item in encoded]) + b"".join(encoded))
+
+
+def _build_ranges(codepoints: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted code points into (first, length) ranges"""
+    ranges = []
+    start = prev = codepoints[0]
+    for cp in codepoints[1:]:
+        if cp - prev > MAX_RANGE_GAP:
+            ranges.append((start, prev - start + 1))
+            start = cp
+        prev = cp
+    ranges.append((start, prev - start + 1))
+    return ranges
+
+
+def compile_pinyin_map(pinyin_map: Dict[str, List[str]], source: Optional[dict] = None) -> bytes:
+    """Compile a dict from load_pinyin_map() into the binary format
+
+    source (see source_identity) is recorded so ensure_binary_dictionary can
+    tell which map a file was compiled from.
+    """
+    syllables = SyllableTable()
+    intern_reading = syllables.intern
+
+    run_lengths: List[int] = []
+    run_pool = array("I")
+
+    def add_run(readings: List[str]) -> int:
+        run_pool.extend(intern_reading(reading) for reading in readings)
+        run_lengths.append(len(readings))
+        return len(run_lengths) - 1
+
+    chars = sorted((ord(key), readings) for key, readings in pinyin_map.items() if len(key) == 1)
+    words = sorted((key, readings) for key, readings in pinyin_map.items() if len(key) > 1)
+
+    ranges = _build_ranges([cp for cp, _ in chars]) if chars else []
+    range_table = array("I")
+    slot_count = 0
+    for start, length in ranges:
+        range_table.extend((start, length, slot_count))
+        slot_count += length
+
+    # Multi-reading characters get the low run indices so they fit in a slot
+    slots = array("H", [MISSING]) * slot_count
+    range_index = -1
+    range_end = 0
+    for cp, readings in chars:
+        while cp >= range_end:
+            range_index += 1
+            range_start, range_length, slot_base = range_table[range_index * 3:range_index * 3 + 3]
+            range_end = range_start + range_length
+        if len(readings) == 1:
+            slot = intern_reading(readings[0])
+            if slot >= MULTI_FLAG:
+                raise ValueError("Too many distinct single-character readings for the binary format")
+        else:
+            slot = MULTI_FLAG | add_run(readings)
+            if slot >= MISSING:
+                raise ValueError("Too many multi-reading characters for the binary format")
+        slots[slot_base + cp - range_start] = slot
+
+    word_runs = array("I", [add_run(readings) for _, readings in words])
+    # Syllable boundaries are found here once rather than on every conversion
+    spaced_lengths: List[int] = []
+    spaced_pool = array("I")
+    for key, readings in words:
+        split = word_syllables(key, readings[0])
+        spaced_pool.extend(intern_reading(syllable) for syllable in split)
+        spaced_lengths.append(len(split))
+
+    sections = {
+        "syllables": _pack_strings(syllables.marks),
+        "ranges": _le_bytes(range_table),
+        "slots": _pad(_le_bytes(slots)),
+        "runs": _pack_offsets(run_lengths) + _le_bytes(run_pool),
+        "words": _pack_strings([key for key, _ in words]) + _le_bytes(word_runs),
+        "spaced": _pack_offsets(spaced_lengths) + _le_bytes(spaced_pool),
+        "source": _pack_strings([json.dumps(source or {}, ensure_ascii=False, sort_keys=True)]),
+    }
+
+    body = bytearray(HEADER.size)
+    layout = []
+    for name in SECTIONS:
+        layout.extend((len(body), len(sections[name])))
+        body.extend(sections[name])
+    HEADER.pack_into(body, 0, MAGIC, VERSION, 0, len(pinyin_map), *layout)
+    return bytes(body)
+
+
+def write_binary_dictionary(pinyin_map: Dict[str, List[str]], path: Union[str, Path] = DEFAULT_BINARY_PATH,
+                            source: Optional[dict] = None) -> int:
+    """Compile a pinyin map to path, returning the artifact size in bytes"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = compile_pinyin_map(pinyin_map, source)
+    # Replace atomically so processes mapping the old file keep a consistent view
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def ensure_binary_dictionary(source: Union[str, Path] = DEFAULT_MAP_PATH,
+                             path: Union[str, Path] = DEFAULT_BINARY_PATH) -> Path:
+    """Compile source to path unless path already holds this version compiled from the same content
+
+    The source's SHA-256 is compared with the one recorded in the file, so
+    a file compiled from another map (or an older version of this one) is
+    rebuilt rather than used.
+    """
+    path = Path(path)
+    identity = source_identity(source)
+    compiled = compiled_source(path)
+    if compiled is None or compiled.get("sha256") != identity["sha256"]:
+        write_binary_dictionary(load_pinyin_map(source), path, identity)
+    return path
+
+
+def compiled_source(path: Union[str, Path]) -> Optional[dict]:
+    """The source recorded in a compiled file; None if it is missing or not the current version"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, _, _, *layout = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                return None
+            index = SECTIONS.index("source")
+            offset, size = layout[2 * index:2 * index + 2]
+            f.seek(offset)
+            section = memoryview(f.read(size))
+    except FileNotFoundError:
+        return None
+    (text,), _ = _read_strings(section)
+    return json.loads(text)
+
+
+def _cast(view: memoryview, typecode: str):
+    """Zero-copy typed view on little-endian hosts, a byteswapped copy elsewhere"""
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+def _read_offsets(section: memoryview) -> Tuple[memoryview, int]:
+    """Return the offset table at the start of a section and where its data begins"""
+    count = struct.unpack_from("<I", section, 0)[0]
+    end = 4 * (count + 2)
+    return _cast(section[4:end], "I"), end
+
+
+def _read_strings(section: memoryview) -> Tuple[List[str], int]:
+    """Decode a string table, returning the strings and the padded table size"""
+    offsets, base = _read_offsets(section)
+    data = bytes(section[base:base + offsets[-1]])
+    strings = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+    end = base + offsets[-1]
+    return strings, end + (-end % 4)
+
+
+class BinaryDictionary(Mapping):
+    """Read-only mapping over a memory-mapped compiled pinyin map
+
+    Readings come back as tuples of interned strings from the SyllableTable.
+    Single-reading entries share one tuple per reading and multi-reading runs
+    are cached on first use, so lookups allocate nothing per entry. Every process that opens the
+    same file shares its pages through the OS page cache, and pickling sends
+    only the path, so pool workers map the file instead of copying the data.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_BINARY_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self._entry_count, *layout = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} compiled pinyin map")
+
+        view = memoryview(self._mmap)
+        sections = {
+            name: view[layout[i * 2]:layout[i * 2] + layout[i * 2 + 1]]
+            for i, name in enumerate(SECTIONS)
+        }
+
+        self.syllables = SyllableTable(_read_strings(sections["syllables"])[0])
+        self._run_cache: Dict[int, Tuple[str, ...]] = {}
+
+        ranges = _cast(sections["ranges"], "I")
+        self._ranges = [tuple(ranges[i:i + 3]) for i in range(0, len(ranges), 3)]
+        self._range_starts = [start for start, _, _ in self._ranges]
+        self._slots = _cast(sections["slots"], "H")
+
+        self._run_offsets, pool_start = _read_offsets(sections["runs"])
+        self._run_pool = _cast(sections["runs"][pool_start:pool_start + 4 * self._run_offsets[-1]], "I")
+
+        keys, runs_start = _read_strings(sections["words"])
+        word_runs = _cast(sections["words"][runs_start:runs_start + 4 * len(keys)], "I")
+        self._words = {key: word_runs[i] for i, key in enumerate(keys)}
+        self._word_index = {key: i for i, key in enumerate(keys)}
+
+        (source,), _ = _read_strings(sections["source"])
+        self.source: dict = json.loads(source)
+
+        self._spaced_offsets, pool_start = _read_offsets(sections["spaced"])
+        self._spaced_pool = _cast(sections["spaced"][pool_start:pool_start + 4 * self._spaced_offsets[-1]], "I")
+
+    def __reduce__(self):
+        return (open_shared_dictionary, (self.path,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the typed views and unmap the file"""
+        for name in ("_slots", "_run_offsets", "_run_pool", "_spaced_offsets", "_spaced_pool"):
+            view = getattr(self, name)
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def __iter__(self) -> Iterator[str]:
+        slots = self._slots
+        for start, length, slot_base in self._ranges:
+            for offset in range(length):
+                if slots[slot_base + offset] != MISSING:
+                    yield chr(start + offset)
+        yield from self._words
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def _run(self, run_index: int) -> Tuple[str, ...]:
+        run = self._run_cache.get(run_index)
+        if run is None:
+            marks = self.syllables.marks
+            pool = self._run_pool
+            start = self._run_offsets[run_index]
+            end = self._run_offsets[run_index + 1]
+            run = self._run_cache[run_index] = tuple(marks[pool[i]] for i in range(start, end))
+        return run
+
+    def _slot(self, key: str) -> int:
+        """Return the slot of a single character, or MISSING"""
+        cp = ord(key)
+        range_index = bisect_right(self._range_starts, cp) - 1
+        if range_index < 0:
+            return MISSING
+        start, length, slot_base = self._ranges[range_index]
+        if cp - start >= length:
+            return MISSING
+        return self._slots[slot_base + cp - start]
+
+    def get_ids(self, key: str) -> Optional[Sequence[int]]:
+        """Return the syllable IDs of an entry's readings"""
+        if len(key) != 1:
+            run_index = self._words.get(key)
+        else:
+            slot = self._slot(key)
+            if slot == MISSING:
+                return None
+            if not slot & MULTI_FLAG:
+                return (slot,)
+            run_index = slot & ~MULTI_FLAG
+        if run_index is None:
+            return None
+        return self._run_pool[self._run_offsets[run_index]:self._run_offsets[run_index + 1]]
+
+    def get(self, key: str, default=None) -> Optional[Tuple[str, ...]]:
+        """Return the readings for a character or word"""
+        if not isinstance(key, str):
+            return default
+        if len(key) != 1:
+            run_index = self._words.get(key)
+            return default if run_index is None else self._run(run_index)
+
+        slot = self._slot(key)
+        if slot == MISSING:
+            return default
+        if slot & MULTI_FLAG:
+            return self._run(slot & ~MULTI_FLAG)
+        return self.syllables.singles[slot]
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        readings = self.get(key)
+        if readings is None:
+            raise KeyError(key)
+        return readings
+
+    def words(self) -> List[str]:
+        """Return the multi-character keys"""
+        return list(self._words)
+
+    def word_syllables(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Syllables of a word's primary reading, as compiled; None for single characters"""
+        index = self._word_index.get(key)
+        if index is None:
+            return None
+        marks = self.syllables.marks
+        pool = self._spaced_pool
+        return tuple(marks[pool[i]] for i in range(self._spaced_offsets[index], self._spaced_offsets[index + 1]))
+
+
+_shared_dictionaries: Dict[Path, Tuple[Tuple[int, int], BinaryDictionary]] = {}
+
+
+def open_shared_dictionary(path: Union[str, Path] = DEFAULT_BINARY_PATH) -> BinaryDictionary:
+    """Return this process's mapping of a compiled dictionary, opening it once
+
+    A dictionary opened before fork() is inherited by the children, which
+    keep reading the parent's pages; unpickling in a spawned worker maps the
+    file afresh through this function. A file replaced since it was mapped
+    (recompiled by ensure_binary_dictionary) is mapped again.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = (stat.st_ino, stat.st_mtime_ns)
+    shared = _shared_dictionaries.get(path)
+    if shared is None or shared[0] != signature:
+        shared = _shared_dictionaries[path] = (signature, BinaryDictionary(path))
+    return shared[1]
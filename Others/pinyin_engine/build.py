@@ -0,0 +1,159 @@
+"""
+Single-pass dictionary build: one canonical source plus overlays -> every platform asset
+
+The manifest (Others/dictionary/dictionary.json) names the base map, the
+overlays applied on top of it in order, the variants (the extra overlays
+of each platform, ending with the pinyin_map.overlay.jsonl log that
+patch_pinyin_map.py keeps next to its map) and the outputs to write, each
+built from one variant. The base is parsed once; each variant is built
+once, each (variant, format) serialized once, and an output is written only
+if its content hash differs from the file already on disk. Empty entries
+are dropped, as load_pinyin_map drops them.
+
+Compiled outputs go under build/dictionary/, apart from build/pinyin_map.bin
+and build/shards, which ensure_binary_dictionary and ensure_sharded_dictionary
+keep compiled from a single map file.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .binary import compile_pinyin_map
+from .dictionary import PROJECT_ROOT, file_digest, normalize_readings
+from .overlay import read_records, replay
+from .shards import serialize_shards
+
+DEFAULT_MANIFEST_PATH = PROJECT_ROOT / "Others" / "dictionary" / "dictionary.json"
+
+OUTPUT_FORMATS = ("pretty", "compact", "binary", "shards")
+
+
+class OutputStatus(NamedTuple):
+    path: Path
+    format: str
+    size: int
+    changed: bool
+    existed: bool  # False for an output this build creates
+
+
+def load_manifest(path: Union[str, Path] = DEFAULT_MANIFEST_PATH) -> dict:
+    """Load a build manifest, resolving its paths relative to the manifest"""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    base_dir = path.parent
+    manifest["base"] = (base_dir / manifest["base"]).resolve()
+    manifest.setdefault("variants", {})
+    overlays = manifest["overlays"] + [entry for entries in manifest["variants"].values() for entry in entries]
+    for entry in overlays + manifest["outputs"]:
+        entry["path"] = (base_dir / entry["path"]).resolve()
+    for entry in manifest["outputs"]:
+        if entry["format"] not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {entry['format']!r}")
+        variant = entry.get("variant")
+        if variant is not None and variant not in manifest["variants"]:
+            raise ValueError(f"Unknown variant: {variant!r}")
+    return manifest
+
+
+def _overlay_records(entry: dict):
+    """Records of one overlay: a JSON mapping applied with the entry's op, or a .jsonl log"""
+    path = entry["path"]
+    if path.suffix == ".jsonl":
+        yield from read_records(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        changes = json.load(f)
+    op = entry.get("op", "set")
+    for key, readings in changes.items():
+        yield {"op": op, "key": key, "readings": readings}
+
+
+def load_base(manifest: dict) -> Dict[str, List[str]]:
+    """Parse the base map, skipping empty entries as load_pinyin_map does"""
+    with open(manifest["base"], "r", encoding="utf-8") as f:
+        data = json.load(f)
+    pinyin_map = {}
+    for key, value in data.items():
+        readings = normalize_readings(value)
+        if key and readings:
+            pinyin_map[key] = readings
+    return pinyin_map
+
+
+def apply_overlays(pinyin_map: Dict[str, List[str]], overlays: List[dict]):
+    """Apply overlays in order, in place; a missing overlay file is skipped"""
+    for entry in overlays:
+        if not entry["path"].exists():
+            continue
+        for key, readings in replay(_overlay_records(entry), pinyin_map).items():
+            readings = normalize_readings(readings) if readings is not None else None
+            if readings:
+                pinyin_map[key] = readings
+            else:
+                pinyin_map.pop(key, None)
+
+
+def build_pinyin_map(manifest: dict, variant: Optional[str] = None,
+                     base: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """Apply the shared overlays, then the variant's, to a copy of the base map"""
+    pinyin_map = dict(base) if base is not None else load_base(manifest)
+    apply_overlays(pinyin_map, manifest["overlays"])
+    if variant is not None:
+        apply_overlays(pinyin_map, manifest["variants"][variant])
+    return pinyin_map
+
+
+def serialize(pinyin_map: Dict[str, List[str]], output_format: str) -> bytes:
+    if output_format == "pretty":
+        # Same layout the add_*.py scripts have always written
+        return json.dumps(pinyin_map, ensure_ascii=False, indent=2).encode("utf-8")
+    if output_format == "compact":
+        return json.dumps(pinyin_map, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return compile_pinyin_map(pinyin_map)
+
+
+def write_if_changed(path: Path, data: bytes, dry_run: bool = False) -> bool:
+    """Write data to path unless the file already has the same content hash"""
+    if path.exists() and file_digest(path) == hashlib.sha256(data).hexdigest():
+        return False
+    if not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return True
+
+
+def build_outputs(manifest_path: Union[str, Path] = DEFAULT_MANIFEST_PATH, dry_run: bool = False) -> List[OutputStatus]:
+    """Build the dictionary and write every output named in the manifest"""
+    manifest = load_manifest(manifest_path)
+    base = load_base(manifest)
+
+    maps: Dict[Optional[str], Dict[str, List[str]]] = {}
+    serialized: Dict[tuple, bytes] = {}
+    statuses = []
+    for entry in manifest["outputs"]:
+        output_format = entry["format"]
+        variant = entry.get("variant")
+        if variant not in maps:
+            maps[variant] = build_pinyin_map(manifest, variant, base)
+        pinyin_map = maps[variant]
+        built = entry["path"].exists()
+        if output_format == "shards":
+            # A directory of files rather than a single one
+            files = serialize_shards(pinyin_map)
+            changed = [write_if_changed(entry["path"] / name, data, dry_run) for name, data in files.items()]
+            statuses.append(OutputStatus(entry["path"], output_format, sum(map(len, files.values())),
+                                         any(changed), built))
+            continue
+        if (variant, output_format) not in serialized:
+            serialized[variant, output_format] = serialize(pinyin_map, output_format)
+        data = serialized[variant, output_format]
+        changed = write_if_changed(entry["path"], data, dry_run)
+        statuses.append(OutputStatus(entry["path"], output_format, len(data), changed, built))
+    return statuses
@@ -0,0 +1,50 @@
+"""
+Dense code-point-indexed tables for single-character lookups
+
+Single-character readings are cached in flat lists indexed by
+ord(char) - base, so looking a character up is an array index rather than
+a string hash and dict probe. The BMP up to the end of the URO block
+(Latin, punctuation, CJK Extension A and the URO) shares one list that the
+converter indexes inline; Extension B and later get a list of their own,
+allocated when text first touches them. Slots are filled from the
+dictionary on first use, which keeps lazily loaded (sharded or compiled)
+dictionaries lazy.
+"""
+
+from typing import Mapping, Optional, Sequence
+
+# One list for code points below BMP_END
+BMP_END = 0xA000
+
+ASTRAL_BASE = 0x20000
+ASTRAL_END = 0x40000
+
+# Slot not yet looked up; a looked-up slot holds the readings or None
+UNFILLED = object()
+
+
+class CodepointTable:
+    """Single-character readings of a dictionary, cached in dense arrays"""
+
+    __slots__ = ("lookup", "bmp", "_astral")
+
+    def __init__(self, pinyin_map: Mapping[str, Sequence[str]]):
+        self.lookup = pinyin_map.get
+        self.bmp = [UNFILLED] * BMP_END
+        self._astral: Optional[list] = None
+
+    def get(self, char: str) -> Optional[Sequence[str]]:
+        """Readings of a single character, or None"""
+        code = ord(char)
+        if code < BMP_END:
+            table, index = self.bmp, code
+        elif ASTRAL_BASE <= code < ASTRAL_END:
+            if self._astral is None:
+                self._astral = [UNFILLED] * (ASTRAL_END - ASTRAL_BASE)
+            table, index = self._astral, code - ASTRAL_BASE
+        else:
+            return self.lookup(char)
+        readings = table[index]
+        if readings is UNFILLED:
+            readings = table[index] = self.lookup(char)
+        return readings
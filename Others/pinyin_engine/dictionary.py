@@ -0,0 +1,164 @@
+"""
+Loading of the pinyin_map.json dictionaries shared by the Android, iOS and Web apps
+"""
+
+import hashlib
+import json
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .spacing import space_reading, word_syllables
+from .syllables import SyllableTable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# The web app's map is the one convertToPinyinWithDetails runs against
+DEFAULT_MAP_PATH = PROJECT_ROOT / "PinYin_Web" / "pinyin_map.json"
+
+
+def normalize_readings(value: Union[str, List[str]]) -> List[str]:
+    """Return readings as a list (the *_original.json maps store plain strings)"""
+    if isinstance(value, list):
+        return [reading for reading in value if reading]
+    return [value] if value else []
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_identity(path: Union[str, Path]) -> Dict[str, str]:
+    """What a compiled artifact records about the map it was built from"""
+    path = Path(path).resolve()
+    return {"path": str(path), "sha256": file_digest(path)}
+
+
+def load_pinyin_map(path: Optional[Union[str, Path]] = None) -> Dict[str, List[str]]:
+    """Load a pinyin_map.json file into a dict of reading lists"""
+    map_path = Path(path) if path is not None else DEFAULT_MAP_PATH
+    with open(map_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    pinyin_map = {}
+    for key, value in data.items():
+        readings = normalize_readings(value)
+        # Empty entries are skipped, as they never produce output in the apps
+        if key and readings:
+            pinyin_map[key] = readings
+    return pinyin_map
+
+
+class PinyinDictionary(Mapping):
+    """In-memory dictionary storing readings as runs of syllable IDs
+
+    Readings are interned once in a SyllableTable and each entry is a slice
+    of a shared array('I'), instead of a list of strings per entry. Lookups
+    return tuples of the interned strings. A word's primary reading is also
+    split into syllables when the word is added.
+    """
+
+    def __init__(self, pinyin_map: Optional[Mapping] = None):
+        self.syllables = SyllableTable()
+        self._entries: Dict[str, int] = {}
+        self._offsets = array("I", [0])
+        self._ids = array("I")
+        self._run_cache: Dict[int, Tuple[str, ...]] = {}
+        self._word_syllables: Dict[str, Tuple[int, ...]] = {}
+        if pinyin_map is not None:
+            for key, value in pinyin_map.items():
+                self.add(key, normalize_readings(value) if isinstance(value, str) else list(value))
+
+    @classmethod
+    def from_file(cls, path: Optional[Union[str, Path]] = None) -> "PinyinDictionary":
+        """Load a pinyin_map.json file"""
+        return cls(load_pinyin_map(path))
+
+    def add(self, key: str, readings: Sequence[str]):
+        """Add or replace an entry (a replaced entry's old run is left unused)"""
+        if not key or not readings:
+            return
+        intern = self.syllables.intern
+        self._ids.extend(intern(reading) for reading in readings)
+        self._entries[key] = len(self._offsets) - 1
+        self._offsets.append(len(self._ids))
+        if len(key) > 1:
+            self._word_syllables[key] = tuple(intern(syllable) for syllable in word_syllables(key, readings[0]))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get_ids(self, key: str) -> Optional[array]:
+        """Return the syllable IDs of an entry's readings"""
+        run_index = self._entries.get(key)
+        if run_index is None:
+            return None
+        return self._ids[self._offsets[run_index]:self._offsets[run_index + 1]]
+
+    def get(self, key: str, default=None) -> Optional[Tuple[str, ...]]:
+        """Return the readings for a character or word"""
+        run_index = self._entries.get(key)
+        if run_index is None:
+            return default
+        start = self._offsets[run_index]
+        end = self._offsets[run_index + 1]
+        if end - start == 1:
+            return self.syllables.singles[self._ids[start]]
+        run = self._run_cache.get(run_index)
+        if run is None:
+            marks = self.syllables.marks
+            run = self._run_cache[run_index] = tuple(marks[self._ids[i]] for i in range(start, end))
+        return run
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        readings = self.get(key)
+        if readings is None:
+            raise KeyError(key)
+        return readings
+
+    def words(self) -> List[str]:
+        """Return the multi-character keys"""
+        return [key for key in self._entries if len(key) > 1]
+
+    def word_syllables(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Syllables of a word's primary reading, None for single characters and missing keys"""
+        ids = self._word_syllables.get(key)
+        if ids is None:
+            return None
+        marks = self.syllables.marks
+        return tuple(marks[syllable_id] for syllable_id in ids)
+
+
+def load_dictionary(path: Optional[Union[str, Path]] = None) -> PinyinDictionary:
+    """Load a pinyin_map.json file into a PinyinDictionary"""
+    return PinyinDictionary.from_file(path)
+
+
+def spaced_reading(pinyin_map, key: str) -> Optional[str]:
+    """A word's primary reading with its syllables spaced, as stored by the dictionary when it can"""
+    stored = getattr(pinyin_map, "word_syllables", None)
+    syllables = stored(key) if stored is not None else None
+    if syllables is not None:
+        return " ".join(syllables)
+    readings = pinyin_map.get(key)
+    return space_reading(readings[0], key) if readings else None
+
+
+def word_keys(pinyin_map) -> List[str]:
+    """Return the multi-character keys of a loaded or compiled dictionary"""
+    words = getattr(pinyin_map, "words", None)
+    if words is not None:
+        return words()
+    return [key for key in pinyin_map if len(key) > 1]
@@ -0,0 +1,185 @@
+"""
+Longest-match pinyin conversion, matching convertToPinyinWithDetails in PinYin_Web/index.html
+"""
+
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from .cache import CacheInfo, LRUCache
+from .codepoints import BMP_END, UNFILLED, CodepointTable
+from .dictionary import DEFAULT_MAP_PATH, load_dictionary, spaced_reading, word_keys
+from .formatting import ToneForms, check_tone_style
+from .matcher import AhoCorasick
+from .overlay import with_overlay
+from .segment import WordModel, best_path, check_segmentation, load_frequencies
+from .syllables import SyllableTable
+
+
+class ConversionResult(NamedTuple):
+    result: str
+    detail_text: str
+
+
+def is_cjk_unified(char: str) -> bool:
+    """Same check as the web app's /[\\u4e00-\\u9fff]/ test"""
+    return "一" <= char <= "鿿"
+
+
+class Converter:
+    """Converts Chinese text to pinyin with a single longest-match pass"""
+
+    def __init__(self,
+                 pinyin_map: Mapping[str, Sequence[str]],
+                 cache_size: int = 0,
+                 segmentation: str = "longest",
+                 frequencies: Optional[Dict[str, int]] = None):
+        """Build a converter over a PinyinDictionary, BinaryDictionary or plain dict
+
+        Only multi-character words go into the matcher; single characters are
+        looked up through a dense code-point table filled on first use, so a
+        compiled or sharded dictionary is never fully decoded.
+        With cache_size > 0, results for the most recently converted
+        (text, tone) pairs are kept and returned without re-segmenting.
+
+        segmentation "longest" is the web app's greedy longest match; "dag"
+        picks the most probable path through every word match, using
+        frequencies (default: dictionary/frequencies.json) as word counts.
+        """
+        check_segmentation(segmentation)
+        self._cache = LRUCache(cache_size) if cache_size > 0 else None
+        self._codepoints = CodepointTable(pinyin_map)
+        self._words: List[str] = word_keys(pinyin_map)
+        self._word_readings: List[Sequence[str]] = [pinyin_map[word] for word in self._words]
+        # Output of each word with its syllables spaced, as split when the dictionary was built
+        self._word_output: List[str] = [spaced_reading(pinyin_map, word) + " " for word in self._words]
+        self._matcher = AhoCorasick()
+        for index, word in enumerate(self._words):
+            self._matcher.add(word, index)
+        self._matcher.build()
+        self._model: Optional[WordModel] = None
+        if segmentation == "dag":
+            if frequencies is None:
+                frequencies = load_frequencies()
+            self._model = WordModel(self._words, frequencies, len(pinyin_map))
+
+        syllables = getattr(pinyin_map, "syllables", None)
+        if syllables is None:
+            syllables = SyllableTable(reading for readings in pinyin_map.values() for reading in readings)
+        self.forms = ToneForms(syllables)
+        self._char_output: Dict[str, str] = {
+            reading: spaced + " " for reading, spaced in zip(syllables.marks, syllables.spaced)
+        }
+        self._zhuyin_output: Optional[tuple] = None
+
+    def _outputs(self, tone: str):
+        """Per-word and per-reading output for a tone style; zhuyin tables are built on first use"""
+        if tone != "zhuyin":
+            return self._word_output, self._char_output
+        if self._zhuyin_output is None:
+            zhuyin = self.forms.zhuyin
+            self._zhuyin_output = (
+                [zhuyin(output[:-1]) + " " for output in self._word_output],
+                {reading: zhuyin(output[:-1]) + " " for reading, output in self._char_output.items()},
+            )
+        return self._zhuyin_output
+
+    def convert_with_details(self, text: str, tone: str = "mark") -> ConversionResult:
+        """Convert text, also listing every alternative reading that was seen
+
+        tone is "mark" (as in the web app), "number" (the web app's tone
+        number option), "plain" or "zhuyin". In those other styles each reading
+        in the details is rendered individually. Zhuyin is rendered per
+        dictionary segment, so text passed through unconverted stays as is.
+        """
+        cache = self._cache
+        if cache is None:
+            return self._convert(text, tone)
+        # One entry serves both convert() and convert_with_details()
+        key = (text, tone)
+        converted = cache.get(key)
+        if converted is None:
+            converted = self._convert(text, tone)
+            cache.put(key, converted)
+        return converted
+
+    def convert(self, text: str, tone: str = "mark") -> str:
+        """Convert text to space separated pinyin"""
+        return self.convert_with_details(text, tone).result
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Hit/miss/eviction counters of the result cache, None if disabled"""
+        return self._cache.info() if self._cache is not None else None
+
+    def cache_clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _convert(self, text: str, tone: str) -> ConversionResult:
+        check_tone_style(tone)
+        # Every word occurrence, of any length, is found in one pass up front
+        if self._model is None:
+            segments = self._matcher.longest_matches(text)
+        else:
+            segments = best_path(text, self._matcher, self._model)
+        # Single characters: an index into the dense BMP table, filled on first use
+        codepoints = self._codepoints
+        bmp = codepoints.bmp
+        lookup = codepoints.lookup
+        word_output, char_output = self._outputs(tone)
+        result: List[str] = []
+        details: List[str] = []
+
+        i = 0
+        length = len(text)
+        while i < length:
+            match = segments.get(i)
+            if match is not None:
+                end, index = match
+                key = self._words[index]
+                readings = self._word_readings[index]
+                result.append(word_output[index])
+                i = end
+            else:
+                key = text[i]
+                code = ord(key)
+                if code < BMP_END:
+                    readings = bmp[code]
+                    if readings is UNFILLED:
+                        readings = bmp[code] = lookup(key)
+                else:
+                    readings = codepoints.get(key)
+                i += 1
+                if readings is None:
+                    result.append(key + " " if is_cjk_unified(key) else key)
+                    continue
+                result.append(char_output[readings[0]])
+
+            if len(readings) > 1:
+                if tone != "mark":
+                    readings = [self.forms.render_reading(reading, tone) for reading in readings]
+                details.append(f"{key}: {', '.join(readings)} ")
+
+        pinyin = "".join(result).strip()
+        if tone != "mark" and tone != "zhuyin":
+            pinyin = self.forms.render(pinyin, tone)
+        return ConversionResult(pinyin, "".join(details).strip())
+
+
+_default_converter: Optional[Converter] = None
+
+
+def get_default_converter() -> Converter:
+    """Return a converter over PinYin_Web/pinyin_map.json and its overlay, loading it once"""
+    global _default_converter
+    if _default_converter is None:
+        _default_converter = Converter(with_overlay(load_dictionary(), DEFAULT_MAP_PATH))
+    return _default_converter
+
+
+def convert(text: str, tone: str = "mark") -> str:
+    """Convert text using the web app's dictionary"""
+    return get_default_converter().convert(text, tone)
+
+
+def convert_with_details(text: str, tone: str = "mark") -> ConversionResult:
+    """Convert text using the web app's dictionary, with reading details"""
+    return get_default_converter().convert_with_details(text, tone)
@@ -0,0 +1,121 @@
+"""
+Tone rendering tables: tone-number and zhuyin-ready forms per syllable
+
+Every form is computed once per syllable when the table is built, so
+formatting a conversion result is a dictionary lookup per syllable instead
+of the per-syllable toneMap scan in convertPinyinToNumber (index.html).
+The "zhuyin" style gives each syllable without marks, ü kept, and its tone
+as a digit (5 for the neutral tone), ready for a zhuyin/bopomofo mapping.
+"""
+
+import re
+from typing import Dict, List
+
+from .spacing import SPACED_READINGS, split_reading
+from .syllables import TONE_MARKS, SyllableTable, tone_mark_to_number
+
+TONE_STYLES = ("mark", "number", "plain", "zhuyin")
+
+# Tone marks removed, ü kept
+PLAIN_TRANSLATION = str.maketrans({
+    tone_char: "ü" if base == "v" else base for tone_char, (base, _) in TONE_MARKS.items()
+})
+
+# Pattern convertPinyinToNumber uses to split an unspaced result longer than four characters
+NUMBER_SPLIT_PATTERN = re.compile(
+    "[bpmfdtnlgkhjqxrzcsywzhchsh]?[a-züÜ]+[āáǎàēéěèīíǐìōóǒòūúǔùǖǘǚǜaeiouü](ng|n)?",
+    re.IGNORECASE,
+)
+
+
+def check_tone_style(style: str):
+    """Raise ValueError for an unknown tone style"""
+    if style not in TONE_STYLES:
+        raise ValueError(f"Unknown tone style: {style!r} (expected one of {', '.join(TONE_STYLES)})")
+
+
+def strip_tones(pinyin: str) -> str:
+    """Remove tone marks, keeping ü"""
+    return pinyin.translate(PLAIN_TRANSLATION)
+
+
+def zhuyin_ready(syllable: str) -> str:
+    """Toneless syllable with ü kept and the tone as a digit, 5 for the neutral tone"""
+    for tone_char, (_, number) in TONE_MARKS.items():
+        if tone_char in syllable:
+            return strip_tones(syllable) + number
+    return syllable + "5"
+
+
+class ToneForms:
+    """Precomputed renderings for every syllable of a SyllableTable
+
+    The token tables also cover the syllables that word readings are spaced
+    into, which is what formatting a finished result string looks up.
+    """
+
+    def __init__(self, syllables: SyllableTable):
+        self.syllables = syllables
+        self.numbers: List[str] = syllables.numbers
+
+        self._number_tokens: Dict[str, str] = {}
+        self._zhuyin_tokens: Dict[str, str] = {}
+        for reading, number, spaced in zip(syllables.marks, self.numbers, syllables.spaced):
+            self._number_tokens[reading] = number
+            self._add_tokens(spaced)
+        for spaced in SPACED_READINGS.values():
+            self._add_tokens(spaced)
+
+    def _add_tokens(self, spaced: str):
+        for token in spaced.split(" "):
+            if token not in self._number_tokens:
+                self._number_tokens[token] = tone_mark_to_number(token)
+            if token not in self._zhuyin_tokens:
+                self._zhuyin_tokens[token] = zhuyin_ready(token)
+
+    def number_token(self, token: str) -> str:
+        """Tone-number form of one space-delimited token"""
+        number = self._number_tokens.get(token)
+        return number if number is not None else tone_mark_to_number(token)
+
+    def to_numbers(self, pinyin: str) -> str:
+        """Port of convertPinyinToNumber for a tone-marked result string"""
+        if " " in pinyin:
+            tokens = pinyin.split(" ")
+        elif len(pinyin) > 4 and "-" not in pinyin:
+            tokens = [match.group(0) for match in NUMBER_SPLIT_PATTERN.finditer(pinyin)] or [pinyin]
+        else:
+            tokens = [pinyin]
+        number_token = self.number_token
+        return " ".join([number_token(token) for token in tokens])
+
+    def zhuyin(self, spaced: str) -> str:
+        """Zhuyin-ready form of a spaced dictionary reading, syllable by syllable
+
+        Only dictionary output may be passed in; converters apply this per
+        matched segment, so text they pass through is never rewritten.
+        """
+        tokens = self._zhuyin_tokens
+        return " ".join([tokens.get(token) or zhuyin_ready(token) for token in spaced.split(" ")])
+
+    def render(self, pinyin: str, style: str) -> str:
+        """Render a tone-marked result string in the given style (any but "zhuyin")"""
+        if style == "mark":
+            return pinyin
+        if style == "number":
+            return self.to_numbers(pinyin)
+        if style == "zhuyin":
+            raise ValueError("zhuyin is rendered per dictionary segment by the converters, not on result strings")
+        check_tone_style(style)
+        return strip_tones(pinyin)
+
+    def render_reading(self, reading: str, style: str) -> str:
+        """Render one dictionary reading, as listed in detail text"""
+        if style == "number":
+            return self.number_token(reading)
+        if style == "zhuyin":
+            # Readings of words are stored unspaced; split them into syllables first
+            syllable_id = self.syllables.id_of(reading)
+            spaced = self.syllables.spaced[syllable_id] if syllable_id is not None else split_reading(reading)
+            return self.zhuyin(spaced)
+        return self.render(reading, style)
@@ -0,0 +1,150 @@
+"""
+Incremental reader for pinyin_map.json files
+
+The file is read in fixed-size chunks and parsed one entry at a time, so
+scanning a map holds one chunk and one entry in memory instead of the full
+dict that json.load builds. Only the map format is accepted: a top-level
+object whose values are a reading string or an array of reading strings.
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from pathlib import Path
+from typing import IO, Iterator, List, Tuple, Union
+
+from .dictionary import normalize_readings
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Fast path: one whole entry without escapes, up to and including its separator
+_WS = r"[ \t\n\r]*"
+_PLAIN_STRING = r'"[^"\\]*"'
+ENTRY = re.compile(
+    rf'{_WS}"([^"\\]*)"{_WS}:{_WS}(?:"([^"\\]*)"|\[({_WS}(?:{_PLAIN_STRING}{_WS}(?:,{_WS}{_PLAIN_STRING}{_WS})*)?)\]){_WS}([,}}])'
+)
+PLAIN_STRING = re.compile(r'"([^"\\]*)"')
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text of the file read so far, minus what has already been parsed"""
+
+    def __init__(self, stream: IO[str], chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping the parsed prefix; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of file"""
+        while True:
+            text = self.text
+            pos = self.pos = WHITESPACE.match(text, self.pos).end()
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise self.error(f"Expecting {char!r}" if found else f"Expecting {char!r}, found end of file")
+        self.pos += 1
+
+    def parse(self, parser):
+        """Run parser(text, pos) -> (value, end), reading more text while the value is incomplete"""
+        while True:
+            try:
+                value, end = parser(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.text, self.pos)
+
+
+def _parse_key(text: str, pos: int):
+    if pos >= len(text) or text[pos] != '"':
+        raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+    return scanstring(text, pos + 1)
+
+
+def _iter_raw_entries(buffer: _Buffer) -> Iterator[Tuple[str, object]]:
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+        return
+    entry_match = ENTRY.match
+    while True:
+        match = entry_match(buffer.text, buffer.pos)
+        if match is not None:
+            key, string, array, separator = match.groups()
+            buffer.pos = match.end()
+            yield key, string if string is not None else PLAIN_STRING.findall(array)
+            if separator == "}":
+                return
+            continue
+
+        # Escapes, or an entry cut off at the end of the buffer
+        buffer.peek()
+        key = buffer.parse(_parse_key)
+        buffer.expect(":")
+        buffer.peek()
+        value = buffer.parse(_decoder.raw_decode)
+        if not isinstance(value, (str, list)) or (isinstance(value, list) and
+                                                  not all(isinstance(reading, str) for reading in value)):
+            raise buffer.error(f"Readings of {key!r} are not a string or a list of strings")
+        yield key, value
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            buffer.pos -= 1
+            raise buffer.error("Expecting ',' delimiter")
+
+
+def iter_map_entries(source: Union[str, Path, IO[str]], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (key, readings) for each entry of a pinyin_map file, in file order
+
+    Readings are normalized as in load_pinyin_map: plain strings (the
+    *_original.json maps) become one-element lists, and entries without a
+    key or readings are skipped. A key that occurs more than once is yielded
+    each time (json.load keeps the last). An empty file yields nothing.
+    source is a path or a text stream.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as stream:
+            yield from iter_map_entries(stream, chunk_size)
+        return
+
+    buffer = _Buffer(source, chunk_size)
+    if buffer.peek() == "":
+        return
+    for key, value in _iter_raw_entries(buffer):
+        readings = normalize_readings(value)
+        if key and readings:
+            yield key, readings
+    if buffer.peek() != "":
+        raise buffer.error("Extra data after the top-level object")
@@ -0,0 +1,210 @@
+"""
+Diff and merge any number of pinyin_map variants in one sorted-key pass
+
+Each map is streamed on its own into key-sorted runs of (key, readings) of at
+most RUN_SIZE entries, spilled to temporary files, and all runs of all maps
+are merged with a heap, so every key is visited once with its readings in
+all maps side by side. Memory stays bounded by the run size per map rather
+than the map's size, and nothing looks keys up in another map's dict.
+"""
+
+import heapq
+import json
+import tempfile
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .dictionary import PROJECT_ROOT
+from .jsonstream import iter_map_entries
+
+PLATFORMS = ["PinYin_Android", "PinYin_iOS", "PinYin_Web"]
+
+MERGE_POLICIES = ("first", "union")
+
+# Entries sorted in memory at a time; longer maps are spilled to disk in runs of this size
+RUN_SIZE = 100_000
+
+Readings = Tuple[str, ...]
+
+
+class KeyReadings(NamedTuple):
+    """One key with its readings in every map, None where the map lacks it"""
+    key: str
+    readings: List[Optional[Readings]]
+
+
+class MapChange(NamedTuple):
+    key: str
+    kind: str  # "added", "removed" or "changed"
+    old: Optional[Readings]
+    new: Optional[Readings]
+
+
+class DiffSummary(NamedTuple):
+    path: Path
+    entries: int
+    added: int
+    removed: int
+    changed: int
+
+
+def find_map_files(root: Union[str, Path] = PROJECT_ROOT) -> List[Path]:
+    """Every pinyin_map*.json variant under the platform directories"""
+    root = Path(root)
+    files = []
+    for name in PLATFORMS:
+        platform_path = root / name
+        if platform_path.exists():
+            # Gradle's build/ copies of the assets are not separate variants
+            files.extend(p for p in sorted(platform_path.rglob("pinyin_map*.json")) if "build" not in p.parts)
+    return files
+
+
+def _spill(entries: List[Tuple[str, Readings]]):
+    """Write a sorted run to a temporary file, one JSON [key, readings] line per entry"""
+    run = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for key, readings in entries:
+        run.write(json.dumps([key, readings], ensure_ascii=False) + "\n")
+    run.seek(0)
+    return run
+
+
+def _read_run(run) -> Iterator[Tuple[str, Readings]]:
+    for line in run:
+        key, readings = json.loads(line)
+        yield key, tuple(readings)
+
+
+def read_sorted_entries(path: Union[str, Path], run_size: int = RUN_SIZE) -> Iterator[Tuple[str, Readings]]:
+    """(key, readings) pairs of one map file in key order; an empty file is an empty map
+
+    At most run_size entries are held in memory: each full run is sorted and
+    spilled to a temporary file, and the runs are merged back lazily.
+    """
+    runs = []
+    try:
+        entries: List[Tuple[str, Readings]] = []
+        for key, readings in iter_map_entries(path):
+            entries.append((key, tuple(readings)))
+            if len(entries) >= run_size:
+                # Stable, so a duplicated key keeps its file order and the last one wins, as with json.load
+                entries.sort(key=itemgetter(0))
+                runs.append(_spill(entries))
+                entries = []
+        entries.sort(key=itemgetter(0))
+        if not runs:
+            yield from entries
+            return
+        # Runs are in file order, so ties on a key go to the earlier run first
+        sources = [_read_run(run) for run in runs] + [iter(entries)]
+        tagged = [_tagged(source, index) for index, source in enumerate(sources)]
+        for key, _, readings in heapq.merge(*tagged, key=itemgetter(0, 1)):
+            yield key, readings
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _tagged(source: Iterable[Tuple[str, Readings]], index: int) -> Iterator[Tuple[str, int, Readings]]:
+    for key, readings in source:
+        yield key, index, readings
+
+
+def merge_entries(sources: Sequence[Iterable[Tuple[str, Readings]]]) -> Iterator[KeyReadings]:
+    """Merge key-sorted entry streams, yielding each key once with its readings per source"""
+    tagged = [_tagged(source, index) for index, source in enumerate(sources)]
+    current: Optional[KeyReadings] = None
+    for key, index, readings in heapq.merge(*tagged, key=itemgetter(0, 1)):
+        if current is None or key != current.key:
+            if current is not None:
+                yield current
+            current = KeyReadings(key, [None] * len(sources))
+        current.readings[index] = readings
+    if current is not None:
+        yield current
+
+
+def scan_maps(paths: Sequence[Union[str, Path]]) -> Iterator[KeyReadings]:
+    """Every key of the given maps, in key order, with its readings in each map"""
+    return merge_entries([read_sorted_entries(path) for path in paths])
+
+
+def classify(old: Optional[Readings], new: Optional[Readings]) -> Optional[str]:
+    """How a key differs from the base map to another one, None if it does not"""
+    if old == new:
+        return None
+    if old is None:
+        return "added"
+    if new is None:
+        return "removed"
+    return "changed"
+
+
+def diff_maps(paths: Sequence[Union[str, Path]]) -> Tuple[List[DiffSummary], Dict[Path, List[MapChange]]]:
+    """Compare every map against the first one in a single pass
+
+    Returns a summary per map (the base included, with zero differences) and
+    the changes of each other map relative to the base, in key order.
+    """
+    if not paths:
+        raise ValueError("no maps to compare")
+    paths = [Path(path) for path in paths]
+    counts = [{"entries": 0, "added": 0, "removed": 0, "changed": 0} for _ in paths]
+    changes: Dict[Path, List[MapChange]] = {path: [] for path in paths[1:]}
+    for key, readings in scan_maps(paths):
+        base = readings[0]
+        for index, other in enumerate(readings):
+            if other is not None:
+                counts[index]["entries"] += 1
+            if index == 0:
+                continue
+            kind = classify(base, other)
+            if kind is not None:
+                counts[index][kind] += 1
+                changes[paths[index]].append(MapChange(key, kind, base, other))
+    summaries = [DiffSummary(path, **count) for path, count in zip(paths, counts)]
+    return summaries, changes
+
+
+def resolve(readings: Sequence[Optional[Readings]], policy: str) -> Optional[Readings]:
+    """Readings of one key under a merge policy; readings are listed in precedence order
+
+    "first" takes the entry of the highest-precedence map that has the key.
+    "union" keeps that map's readings first (so its default reading wins) and
+    appends readings only lower-precedence maps list.
+    """
+    present = [entry for entry in readings if entry is not None]
+    if not present:
+        return None
+    if policy == "first":
+        return present[0]
+    if policy == "union":
+        merged: List[str] = []
+        for entry in present:
+            merged.extend(reading for reading in entry if reading not in merged)
+        return tuple(merged)
+    raise ValueError(f"Unknown merge policy: {policy!r} (expected one of {', '.join(MERGE_POLICIES)})")
+
+
+def merge_maps(paths: Sequence[Union[str, Path]], policy: str = "first") -> Iterator[Tuple[str, Readings]]:
+    """Merged (key, readings) in key order; paths are listed highest precedence first"""
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy: {policy!r} (expected one of {', '.join(MERGE_POLICIES)})")
+    for key, readings in scan_maps(paths):
+        merged = resolve(readings, policy)
+        if merged is not None:
+            yield key, merged
+
+
+def write_map(entries: Iterable[Tuple[str, Readings]], path: Union[str, Path]) -> int:
+    """Write entries as a pinyin_map.json, one at a time, in json.dump(indent=2) layout"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("{")
+        for key, readings in entries:
+            body = json.dumps(list(readings), ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            out.write(f"{',' if count else ''}\n  {json.dumps(key, ensure_ascii=False)}: {body}")
+            count += 1
+        out.write("\n}" if count else "}")
+    return count
@@ -0,0 +1,110 @@
+"""
+Aho-Corasick automaton over dictionary words
+
+Finds every occurrence of every word in one left-to-right pass over the
+text, whatever the word lengths, instead of re-walking a trie from each
+position.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+ROOT = 0
+NO_VALUE = -1
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; add() every key, then build() before matching"""
+
+    def __init__(self):
+        # Flat node arrays; node 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [ROOT]
+        # Nearest node on the failure chain (excluding this one) that ends a key
+        self._output_link: List[int] = [ROOT]
+        self._values: List[int] = [NO_VALUE]
+        self._depths: List[int] = [0]
+        self._built = True
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._values if value != NO_VALUE)
+
+    def add(self, key: str, value: int):
+        """Add a key with a non-negative value (e.g. an entry index)"""
+        if not key:
+            raise ValueError("empty key")
+        node = ROOT
+        for char in key:
+            children = self._goto[node]
+            child = children.get(char)
+            if child is None:
+                child = len(self._goto)
+                children[char] = child
+                self._goto.append({})
+                self._fail.append(ROOT)
+                self._output_link.append(ROOT)
+                self._values.append(NO_VALUE)
+                self._depths.append(self._depths[node] + 1)
+            node = child
+        self._values[node] = value
+        self._built = False
+
+    def build(self):
+        """Compute failure and output links breadth-first"""
+        goto = self._goto
+        fail = self._fail
+        output_link = self._output_link
+        values = self._values
+        queue = deque()
+        for child in goto[ROOT].values():
+            fail[child] = ROOT
+            output_link[child] = ROOT
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state != ROOT and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, ROOT)
+                fail[child] = target
+                output_link[child] = target if values[target] != NO_VALUE else output_link[target]
+                queue.append(child)
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, value) for every key occurrence, ordered by end"""
+        if not self._built:
+            self.build()
+        goto = self._goto
+        fail = self._fail
+        output_link = self._output_link
+        values = self._values
+        depths = self._depths
+        node = ROOT
+        for pos, char in enumerate(text):
+            while True:
+                child = goto[node].get(char)
+                if child is not None:
+                    node = child
+                    break
+                if node == ROOT:
+                    break
+                node = fail[node]
+            end = pos + 1
+            match = node if values[node] != NO_VALUE else output_link[node]
+            while match != ROOT:
+                yield end - depths[match], end, values[match]
+                match = output_link[match]
+
+    def longest_matches(self, text: str) -> Dict[int, Tuple[int, int]]:
+        """Map each start position to (end, value) of the longest key starting there
+
+        Positions where no key starts are absent.
+        """
+        longest: Dict[int, Tuple[int, int]] = {}
+        for start, end, value in self.iter_matches(text):
+            best = longest.get(start)
+            if best is None or end > best[0]:
+                longest[start] = (end, value)
+        return longest
@@ -0,0 +1,212 @@
+"""
+Append-only overlay of dictionary changes, consulted at lookup time
+
+Each line of an overlay file is a JSON record:
+
+    {"op": "set", "key": "银行", "readings": ["yínháng"]}
+    {"op": "add", "key": "你好", "readings": ["nǐhǎo"]}     (only if the key is missing)
+    {"op": "delete", "key": "㐀"}
+
+Adding words appends a few lines instead of rewriting the 1.1 MB map, and
+appends are serialized with an exclusive lock so concurrent edits do not
+overwrite each other. compact() folds the overlay into pinyin_map.json.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .dictionary import normalize_readings, word_keys
+from .spacing import word_syllables
+from .syllables import SyllableTable
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still single writes, but unlocked
+    fcntl = None
+
+OPS = ("set", "add", "delete")
+
+# Deleted keys are recorded as None in a replayed overlay
+Changes = Dict[str, Optional[List[str]]]
+
+
+def overlay_path_for(map_path: Union[str, Path]) -> Path:
+    """pinyin_map.json -> pinyin_map.overlay.jsonl next to it"""
+    map_path = Path(map_path)
+    return map_path.with_name(f"{map_path.stem}.overlay.jsonl")
+
+
+@contextmanager
+def _locked(path: Path, mode: str):
+    with open(path, mode, encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def append_changes(overlay_path: Union[str, Path], changes: Mapping, op: str = "set") -> int:
+    """Append changes (key -> readings) to an overlay; returns the record count
+
+    All records go out in one locked write, so a batch is never interleaved
+    with another writer's.
+    """
+    if op not in OPS:
+        raise ValueError(f"Unknown overlay op: {op!r} (expected one of {', '.join(OPS)})")
+    lines = []
+    for key, readings in changes.items():
+        record = {"op": op, "key": key}
+        if op != "delete":
+            record["readings"] = normalize_readings(readings)
+            if not record["readings"]:
+                raise ValueError(f"No readings given for {key!r}")
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+    overlay_path = Path(overlay_path)
+    with _locked(overlay_path, "a") as f:
+        f.write("".join(lines))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(lines)
+
+
+def replay(records, base: Optional[Mapping] = None) -> Changes:
+    """Fold overlay records into key -> readings (None for deleted keys)"""
+    changes: Changes = {}
+    for record in records:
+        key = record["key"]
+        op = record.get("op", "set")
+        if op == "delete":
+            changes[key] = None
+        elif op == "add":
+            exists = changes[key] is not None if key in changes else (base is not None and key in base)
+            if not exists:
+                changes[key] = normalize_readings(record["readings"])
+        elif op == "set":
+            changes[key] = normalize_readings(record["readings"])
+        else:
+            raise ValueError(f"Unknown overlay op: {op!r}")
+    return changes
+
+
+def read_records(overlay_path: Union[str, Path]) -> Iterator[dict]:
+    """Yield the records of an overlay file (nothing if it does not exist)"""
+    overlay_path = Path(overlay_path)
+    if not overlay_path.exists():
+        return
+    with open(overlay_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A writer killed mid-append leaves at most a torn last line
+                raise ValueError(f"{overlay_path}:{line_number}: malformed overlay record") from None
+
+
+def read_overlay(overlay_path: Union[str, Path], base: Optional[Mapping] = None) -> Changes:
+    """Replay an overlay file against a base dictionary"""
+    return replay(read_records(overlay_path), base)
+
+
+class OverlayDictionary(Mapping):
+    """Read-only view of a base dictionary with overlay changes applied"""
+
+    def __init__(self, base: Mapping, changes: Changes):
+        self.base = base
+        self._changes: Dict[str, Optional[Tuple[str, ...]]] = {
+            key: tuple(readings) if readings is not None else None for key, readings in changes.items()
+        }
+        base_syllables = getattr(base, "syllables", None)
+        self.syllables = SyllableTable(base_syllables.marks if base_syllables is not None else ())
+        for readings in self._changes.values():
+            for reading in readings or ():
+                self.syllables.intern(reading)
+
+    def get(self, key: str, default=None) -> Optional[Sequence[str]]:
+        if key in self._changes:
+            readings = self._changes[key]
+            return default if readings is None else readings
+        return self.base.get(key, default)
+
+    def __getitem__(self, key: str) -> Sequence[str]:
+        readings = self.get(key)
+        if readings is None:
+            raise KeyError(key)
+        return readings
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.base:
+            if key not in self._changes:
+                yield key
+        for key, readings in self._changes.items():
+            if readings is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def words(self) -> List[str]:
+        """Return the multi-character keys"""
+        words = [key for key in word_keys(self.base) if key not in self._changes]
+        words.extend(key for key, readings in self._changes.items() if readings is not None and len(key) > 1)
+        return words
+
+    def word_syllables(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Syllables of a word's primary reading: the base's, or split now for a changed word"""
+        if key in self._changes:
+            readings = self._changes[key]
+            if readings is None or len(key) < 2:
+                return None
+            return tuple(word_syllables(key, readings[0]))
+        base_syllables = getattr(self.base, "word_syllables", None)
+        return base_syllables(key) if base_syllables is not None else None
+
+
+def with_overlay(dictionary: Mapping, map_path: Union[str, Path]) -> Mapping:
+    """Wrap a dictionary loaded from map_path with its overlay, if there is one"""
+    changes = read_overlay(overlay_path_for(map_path), dictionary)
+    return OverlayDictionary(dictionary, changes) if changes else dictionary
+
+
+def compact(map_path: Union[str, Path], overlay_path: Optional[Union[str, Path]] = None) -> int:
+    """Rewrite map_path with its overlay applied, then empty the overlay
+
+    The overlay stays locked throughout, so appends made meanwhile wait and
+    land in the fresh overlay. Returns the number of keys changed.
+    """
+    map_path = Path(map_path)
+    overlay_path = Path(overlay_path) if overlay_path is not None else overlay_path_for(map_path)
+    if not overlay_path.exists():
+        return 0
+
+    with _locked(overlay_path, "r+") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+        with open(map_path, "r", encoding="utf-8") as map_file:
+            data = json.load(map_file)
+        changes = replay(records, data)
+        for key, readings in changes.items():
+            if readings is None:
+                data.pop(key, None)
+            else:
+                data[key] = readings
+
+        tmp_path = map_path.with_name(f"{map_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            json.dump(data, out, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, map_path)
+
+        f.seek(0)
+        f.truncate()
+    return len(changes)
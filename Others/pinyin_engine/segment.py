@@ -0,0 +1,100 @@
+"""
+Maximum-probability segmentation over the word DAG
+
+Every dictionary word found in the text is an edge of a DAG over character
+positions; single characters are always edges too. The best path maximizes
+the summed log-probability of its words, computed with one forward pass
+over the matches (which the Aho-Corasick matcher yields ordered by end) and
+plain arrays for the DP state.
+"""
+
+import json
+import math
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .dictionary import PROJECT_ROOT
+from .matcher import NO_VALUE, AhoCorasick
+
+SEGMENTATIONS = ("longest", "dag")
+
+# Word -> corpus count, kept next to the build manifest
+DEFAULT_FREQUENCY_PATH = PROJECT_ROOT / "Others" / "dictionary" / "frequencies.json"
+
+# Count assumed for entries (and unknown characters) absent from the table
+DEFAULT_COUNT = 1
+
+
+def check_segmentation(mode: str):
+    """Raise ValueError for an unknown segmentation mode"""
+    if mode not in SEGMENTATIONS:
+        raise ValueError(f"Unknown segmentation: {mode!r} (expected one of {', '.join(SEGMENTATIONS)})")
+
+
+def load_frequencies(path: Optional[Union[str, Path]] = None) -> Dict[str, int]:
+    """Load a {word: count} table; a missing file gives an empty table"""
+    frequency_path = Path(path) if path is not None else DEFAULT_FREQUENCY_PATH
+    if not frequency_path.exists():
+        return {}
+    with open(frequency_path, "r", encoding="utf-8") as f:
+        return {key: int(count) for key, count in json.load(f).items() if int(count) > 0}
+
+
+class WordModel:
+    """Unigram log-probabilities, precomputed per word index and per character"""
+
+    def __init__(self, words: Sequence[str], frequencies: Dict[str, int], keys_count: int):
+        # Every dictionary entry contributes at least DEFAULT_COUNT to the total
+        total = sum(frequencies.values()) + DEFAULT_COUNT * max(keys_count - len(frequencies), 0)
+        log_total = math.log(max(total, 1))
+        self.word_logprobs = array("d", (
+            math.log(frequencies.get(word, DEFAULT_COUNT)) - log_total for word in words
+        ))
+        self.char_logprobs: Dict[str, float] = {
+            key: math.log(count) - log_total for key, count in frequencies.items() if len(key) == 1
+        }
+        self.default_logprob = math.log(DEFAULT_COUNT) - log_total
+
+
+def best_path(text: str, matcher: AhoCorasick, model: WordModel) -> Dict[int, Tuple[int, int]]:
+    """Map the start of each word on the most probable path to (end, word index)
+
+    Same shape as AhoCorasick.longest_matches, so the converter walks either.
+    """
+    length = len(text)
+    score = array("d", bytes(8 * (length + 1)))
+    back = array("i", range(-1, length))  # start of the edge ending at each position
+    back_word = array("i", [NO_VALUE]) * (length + 1)
+    char_logprobs = model.char_logprobs
+    default_logprob = model.default_logprob
+    word_logprobs = model.word_logprobs
+
+    end = 0
+    matches = matcher.iter_matches(text)
+    match = next(matches, None)
+    for end in range(1, length + 1):
+        # Word edges ending here come longest first; ties keep the longer word
+        best = -math.inf
+        best_start = end - 1
+        best_word = NO_VALUE
+        while match is not None and match[1] == end:
+            start, _, index = match
+            candidate = score[start] + word_logprobs[index]
+            if candidate > best:
+                best, best_start, best_word = candidate, start, index
+            match = next(matches, None)
+        candidate = score[end - 1] + char_logprobs.get(text[end - 1], default_logprob)
+        if candidate > best:
+            best, best_start, best_word = candidate, end - 1, NO_VALUE
+        score[end] = best
+        back[end] = best_start
+        back_word[end] = best_word
+
+    path: Dict[int, Tuple[int, int]] = {}
+    while end > 0:
+        start = back[end]
+        if back_word[end] != NO_VALUE:
+            path[start] = (end, back_word[end])
+        end = start
+    return path
@@ -0,0 +1,275 @@
+"""
+Asyncio HTTP conversion server with micro-batching (stdlib only)
+
+The dictionary is loaded once. Concurrent requests are queued and converted
+in micro-batches on a single worker thread, so the event loop keeps
+accepting connections while segmentation runs.
+
+    POST /convert  {"text": "银行家", "tone": "number", "details": true}
+    POST /convert  {"texts": ["银行", "行家"]}
+    GET  /stats    request count, batch sizes and latency percentiles
+    GET  /health
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .engine import Converter
+from .formatting import check_tone_style
+
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyStats:
+    """Latency percentiles over the most recent requests"""
+
+    def __init__(self, window: int = 10000):
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, points: Sequence[int] = (50, 90, 99)) -> Dict[str, float]:
+        """Nearest-rank percentiles in milliseconds"""
+        if not self._samples:
+            return {}
+        samples = sorted(self._samples)
+        last = len(samples) - 1
+        stats = {f"p{point}": samples[min(last, len(samples) * point // 100)] * 1000 for point in points}
+        stats["max"] = samples[-1] * 1000
+        return stats
+
+
+class MicroBatcher:
+    """Coalesces concurrent conversions into batches run off the event loop
+
+    A batch is flushed once max_batch texts are waiting or max_delay seconds
+    after its first text arrived, whichever comes first. Batches run one at
+    a time on a single thread, since a Converter (and its cache) is not
+    shared between threads.
+    """
+
+    def __init__(self, converter: Converter, max_batch: int = 64, max_delay: float = 0.002):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.converter = converter
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.batched_texts = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pinyin-batch")
+        self._pending: List[Tuple[str, str, bool, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, text: str, tone: str = "mark", details: bool = False):
+        """Queue one text and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, tone, details, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    async def submit_many(self, texts: Sequence[str], tone: str = "mark", details: bool = False) -> list:
+        """Queue several texts; results come back in input order"""
+        return list(await asyncio.gather(*(self.submit(text, tone, details) for text in texts)))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.batched_texts += len(batch)
+        job = asyncio.get_running_loop().run_in_executor(self._executor, self._convert_batch, batch)
+        job.add_done_callback(lambda done: self._resolve(batch, done))
+
+    def _convert_batch(self, batch) -> list:
+        converter = self.converter
+        results = []
+        for text, tone, details, _ in batch:
+            converted = converter.convert_with_details(text, tone)
+            results.append(converted if details else converted.result)
+        return results
+
+    @staticmethod
+    def _resolve(batch, done: asyncio.Future):
+        error = done.exception()
+        results = done.result() if error is None else [None] * len(batch)
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def _encode_result(converted, details: bool) -> Dict[str, str]:
+    if details:
+        return {"pinyin": converted.result, "details": converted.detail_text}
+    return {"pinyin": converted}
+
+
+class ConversionServer:
+    """Minimal HTTP/1.1 front end (keep-alive, JSON bodies) over a MicroBatcher"""
+
+    def __init__(self, converter: Converter, max_batch: int = 64, max_delay: float = 0.002):
+        self.batcher = MicroBatcher(converter, max_batch, max_delay)
+        self.latency = LatencyStats()
+        self.started = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        self.batcher.close()
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self.batcher.batches
+        stats = {
+            "requests": self.latency.count,
+            "uptime_s": round(time.time() - self.started, 3),
+            "batches": batches,
+            "mean_batch_size": self.batcher.batched_texts / batches if batches else 0,
+            "latency_ms": self.latency.percentiles(),
+        }
+        cache_info = self.batcher.converter.cache_info()
+        if cache_info is not None:
+            stats["cache"] = cache_info._asdict()
+        return stats
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                keep_alive = True
+                path = None
+                try:
+                    method, path, version, headers = self._parse_head(request_line, await self._read_headers(reader))
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    try:
+                        length = int(headers.get("content-length") or 0)
+                    except ValueError:
+                        keep_alive = False
+                        raise HTTPError(400, "invalid Content-Length")
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HTTPError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = 200, await self._dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if path == "/convert":
+                    self.latency.record(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    @staticmethod
+    def _parse_head(request_line: bytes, headers: Dict[str, str]):
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise HTTPError(400, "malformed request line")
+        method, path, version = parts
+        return method, path.split("?", 1)[0], version, headers
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Dict[str, Any]:
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/stats":
+            return self.stats()
+        if path != "/convert":
+            raise HTTPError(404, f"no such endpoint: {path}")
+        if method != "POST":
+            raise HTTPError(405, "use POST")
+
+        try:
+            request = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "expected a JSON object")
+
+        tone = request.get("tone", "mark")
+        details = bool(request.get("details", False))
+        try:
+            check_tone_style(tone)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        if "texts" in request:
+            texts = request["texts"]
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise HTTPError(400, "texts must be a list of strings")
+            results = await self.batcher.submit_many(texts, tone, details)
+            return {"results": [_encode_result(result, details) for result in results]}
+        text = request.get("text")
+        if not isinstance(text, str):
+            raise HTTPError(400, "text must be a string")
+        return _encode_result(await self.batcher.submit(text, tone, details), details)
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
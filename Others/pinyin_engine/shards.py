@@ -0,0 +1,197 @@
+"""
+Dictionary split into shards by Unicode block, loaded on first lookup
+
+Nearly every key is a single character and most of those are in CJK
+Extension A or later blocks that everyday text never touches. A sharded
+dictionary parses only the index (syllable table and entry counts) up
+front; each shard is read the first time a key from its block is looked up.
+
+Layout of a shard directory:
+
+    index.json     {"version", "build", "source", "syllables": [...], "shards": {name: {"file", "entries"}}}
+    <shard>.json   {"build", "entries": {key: [syllable ID, ...]}}
+
+The "word_syllables" shard holds, per word, the IDs of the syllables its
+primary reading splits into, so converters never split readings themselves.
+"source" records the path and SHA-256 of the map the shards were built from.
+
+Syllable IDs are renumbered on every build, so "build", a hash of the
+syllable table and every shard's entries, is stamped into the index and
+each shard. A dictionary that loaded one index refuses shards written by a
+later build instead of decoding them with the wrong syllable table.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .dictionary import DEFAULT_MAP_PATH, load_pinyin_map, source_identity
+from .spacing import word_syllables
+from .syllables import SyllableTable
+
+INDEX_NAME = "index.json"
+SHARD_VERSION = 3
+
+DEFAULT_SHARDS_PATH = Path(__file__).resolve().parents[1] / "build" / "shards"
+
+# Single characters by block, in lookup order; multi-character keys go to "words"
+BLOCKS: List[Tuple[str, int, int]] = [
+    ("uro", 0x4E00, 0x9FFF),
+    ("ext_a", 0x3400, 0x4DBF),
+    ("ext_b_plus", 0x20000, 0x3FFFF),
+]
+SHARD_NAMES = tuple(name for name, _, _ in BLOCKS) + ("other", "words", "word_syllables")
+
+
+def shard_of(key: str) -> str:
+    """Name of the shard a key is stored in"""
+    if len(key) != 1:
+        return "words"
+    codepoint = ord(key)
+    for name, first, last in BLOCKS:
+        if first <= codepoint <= last:
+            return name
+    return "other"
+
+
+def serialize_shards(pinyin_map: Dict[str, List[str]], source: Optional[dict] = None) -> Dict[str, bytes]:
+    """Encode a pinyin map as {file name: content} for a shard directory; source as in source_identity"""
+    syllables = SyllableTable()
+    shards: Dict[str, Dict[str, List[int]]] = {name: {} for name in SHARD_NAMES}
+    for key, readings in pinyin_map.items():
+        if key and readings:
+            shards[shard_of(key)][key] = [syllables.intern(reading) for reading in readings]
+            if len(key) > 1:
+                shards["word_syllables"][key] = [
+                    syllables.intern(syllable) for syllable in word_syllables(key, readings[0])
+                ]
+
+    bodies = {name: json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+              for name, entries in shards.items()}
+    digest = hashlib.sha256(json.dumps(syllables.marks, ensure_ascii=False).encode("utf-8"))
+    for name, body in bodies.items():
+        digest.update(f"\n{name}\n".encode("utf-8"))
+        digest.update(body)
+    build = digest.hexdigest()
+
+    files: Dict[str, bytes] = {}
+    index = {"version": SHARD_VERSION, "build": build, "source": source or {},
+             "syllables": syllables.marks, "shards": {}}
+    for name, body in bodies.items():
+        file_name = f"{name}.json"
+        files[file_name] = b'{"build":"' + build.encode("ascii") + b'","entries":' + body + b"}"
+        index["shards"][name] = {"file": file_name, "entries": len(shards[name])}
+    files[INDEX_NAME] = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return files
+
+
+def write_sharded_dictionary(pinyin_map: Dict[str, List[str]], directory: Union[str, Path] = DEFAULT_SHARDS_PATH,
+                             source: Optional[dict] = None) -> int:
+    """Write a shard directory, returning its total size in bytes"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = serialize_shards(pinyin_map, source)
+    # The index goes last so a reader never sees it ahead of its shards
+    names = sorted(files, key=lambda name: name == INDEX_NAME)
+    for name in names:
+        tmp_path = directory / f"{name}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(files[name])
+        os.replace(tmp_path, directory / name)
+    return sum(len(data) for data in files.values())
+
+
+def ensure_sharded_dictionary(source: Union[str, Path] = DEFAULT_MAP_PATH,
+                              directory: Union[str, Path] = DEFAULT_SHARDS_PATH) -> Path:
+    """Shard source into directory unless it already holds this version built from the same content"""
+    directory = Path(directory)
+    identity = source_identity(source)
+    built = sharded_source(directory)
+    if built is None or built.get("sha256") != identity["sha256"]:
+        write_sharded_dictionary(load_pinyin_map(source), directory, identity)
+    return directory
+
+
+def sharded_source(directory: Union[str, Path]) -> Optional[dict]:
+    """The source recorded in a shard index; None if it is missing or not the current version"""
+    try:
+        with open(Path(directory) / INDEX_NAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return None
+    if index.get("version") != SHARD_VERSION:
+        return None
+    return index.get("source", {})
+
+
+class ShardedDictionary(Mapping):
+    """Read-only dictionary over a shard directory, parsing each shard on first hit"""
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_SHARDS_PATH):
+        self.directory = Path(directory)
+        with open(self.directory / INDEX_NAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != SHARD_VERSION:
+            raise ValueError(f"{self.directory}: unsupported shard version {index.get('version')}")
+        self.build: str = index["build"]
+        self.source: dict = index.get("source", {})
+        self.syllables = SyllableTable(index["syllables"])
+        self._shard_info: Dict[str, dict] = index["shards"]
+        self._shards: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+
+    @property
+    def loaded_shards(self) -> List[str]:
+        return list(self._shards)
+
+    def _shard(self, name: str) -> Dict[str, Tuple[str, ...]]:
+        shard = self._shards.get(name)
+        if shard is None:
+            info = self._shard_info.get(name)
+            shard = {}
+            if info is not None:
+                with open(self.directory / info["file"], "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                if raw.get("build") != self.build:
+                    raise ValueError(f"{self.directory / info['file']}: shard is from another build than the "
+                                     f"index this dictionary loaded; open the directory again")
+                raw = raw["entries"]
+                marks = self.syllables.marks
+                singles = self.syllables.singles
+                for key, ids in raw.items():
+                    shard[key] = singles[ids[0]] if len(ids) == 1 else tuple(marks[i] for i in ids)
+            self._shards[name] = shard
+        return shard
+
+    def get(self, key: str, default=None) -> Optional[Tuple[str, ...]]:
+        """Return the readings for a character or word, loading its shard if needed"""
+        if not isinstance(key, str) or not key:
+            return default
+        return self._shard(shard_of(key)).get(key, default)
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        readings = self.get(key)
+        if readings is None:
+            raise KeyError(key)
+        return readings
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return sum(info["entries"] for name, info in self._shard_info.items() if name != "word_syllables")
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._shard_info:
+            if name != "word_syllables":
+                yield from self._shard(name)
+
+    def words(self) -> List[str]:
+        """Return the multi-character keys (loads only the words shard)"""
+        return list(self._shard("words"))
+
+    def word_syllables(self, key: str) -> Optional[Tuple[str, ...]]:
+        """Syllables of a word's primary reading, as sharded; None for single characters"""
+        return self._shard("word_syllables").get(key)
@@ -0,0 +1,67 @@
+"""
+Interned reading table shared by the in-memory and compiled dictionaries
+"""
+
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .spacing import split_reading
+
+# Same entries, in the same order, as the toneMap in PinYin_Web/index.html
+TONE_MARKS: Dict[str, Tuple[str, str]] = {
+    "ā": ("a", "1"), "á": ("a", "2"), "ǎ": ("a", "3"), "à": ("a", "4"),
+    "ē": ("e", "1"), "é": ("e", "2"), "ě": ("e", "3"), "è": ("e", "4"),
+    "ī": ("i", "1"), "í": ("i", "2"), "ǐ": ("i", "3"), "ì": ("i", "4"),
+    "ō": ("o", "1"), "ó": ("o", "2"), "ǒ": ("o", "3"), "ò": ("o", "4"),
+    "ū": ("u", "1"), "ú": ("u", "2"), "ǔ": ("u", "3"), "ù": ("u", "4"),
+    "ǖ": ("v", "1"), "ǘ": ("v", "2"), "ǚ": ("v", "3"), "ǜ": ("v", "4"),
+}
+
+
+def tone_mark_to_number(syllable: str) -> str:
+    """Port of convertSingleSyllable: move the first tone mark found to a trailing digit"""
+    for tone_char, (base, number) in TONE_MARKS.items():
+        if tone_char in syllable:
+            return syllable.replace(tone_char, base, 1) + number
+    return syllable
+
+
+class SyllableTable:
+    """Distinct readings addressed by small integer IDs
+
+    Each reading is stored once as an interned string, alongside its
+    tone-number rendering, its syllables spaced as in the web app, and a
+    shared one-element tuple that dictionaries hand out for single-reading
+    entries.
+    """
+
+    def __init__(self, readings: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self.marks: List[str] = []
+        self.numbers: List[str] = []
+        self.spaced: List[str] = []
+        self.singles: List[Tuple[str]] = []
+        for reading in readings:
+            self.intern(reading)
+
+    def __len__(self) -> int:
+        return len(self.marks)
+
+    def __getitem__(self, syllable_id: int) -> str:
+        return self.marks[syllable_id]
+
+    def intern(self, reading: str) -> int:
+        """Return the ID of a reading, adding it to the table if needed"""
+        syllable_id = self._ids.get(reading)
+        if syllable_id is None:
+            reading = sys.intern(reading)
+            syllable_id = self._ids[reading] = len(self.marks)
+            self.marks.append(reading)
+            self.numbers.append(sys.intern(tone_mark_to_number(reading)))
+            self.spaced.append(sys.intern(split_reading(reading)))
+            self.singles.append((reading,))
+        return syllable_id
+
+    def id_of(self, reading: str) -> Optional[int]:
+        """Return the ID of a reading, or None if it is not in the table"""
+        return self._ids.get(reading)
@@ -0,0 +1,314 @@
+"""
+Dictionary validation: per-entry rules run in parallel, cross-file rules in one merge pass
+
+Every map is parsed once with the incremental reader, in a process pool
+task of its own. The entry rules (syllable inventory, tone-mark placement,
+syllable count, missing apostrophes) depend only on the entry itself, so the
+entries of all maps are then checked in fixed-size chunks spread over the
+same pool. Duplicate keys are caught while parsing, and copies of the same
+map on different platforms are compared key by key with the sorted-key merge.
+"""
+
+import ast
+import multiprocessing
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .dictionary import PROJECT_ROOT
+from .jsonstream import iter_map_entries
+from .mapdiff import merge_entries
+from .syllables import TONE_MARKS
+
+# Toneless syllables: standard Mandarin, plus the rare and interjection
+# readings that occur in the Unihan-derived maps
+SYLLABLES = frozenset("""
+a ai an ang ao
+ba bai ban bang bao bei ben beng bi bian biang biao bie bin bing bo bong bu
+ca cai can cang cao ce cei cen ceng cha chai chan chang chao che chen cheng chi chong chou chu chua chuai
+chuan chuang chui chun chuo ci cong cou cu cuan cui cun cuo
+da dai dan dang dao de dei den deng di dia dian diao die din ding diu dong dou du duan dui dun duo
+e ei en eng er ê
+fa fan fang fei fen feng fiao fo fou fu
+ga gai gan gang gao ge gei gen geng gong gou gu gua guai guan guang gui gun guo
+ha hai han hang hao he hei hen heng hm hng hong hou hu hua huai huan huang hui hun huo
+ji jia jian jiang jiao jie jin jing jiong jiu ju juan jue jun
+ka kai kan kang kao ke kei ken keng kong kou ku kua kuai kuan kuang kui kun kuo
+la lai lan lang lao le lei leng li lia lian liang liao lie lin ling liu lo long lou lu luan lun luo lü lüe
+m ma mai man mang mao me mei men meng mi mian miao mie min ming miu mo mou mu
+n na nai nan nang nao ne nei nen neng ng ni nian niang niao nie nin ning niu nong nou nu nuan nun nuo nü nüe
+o ou
+pa pai pan pang pao pei pen peng pi pian piao pie pin ping po pou pu
+qi qia qian qiang qiao qie qin qing qiong qiu qu quan que qun
+ran rang rao re ren reng ri rong rou ru rua ruan rui run ruo
+sa sai san sang sao se sen seng sha shai shan shang shao she shei shen sheng shi shou shu shua shuai shuan
+shuang shui shun shuo si song sou su suan sui sun suo
+ta tai tan tang tao te tei teng ti tian tiao tie ting tong tou tu tuan tui tun tuo
+wa wai wan wang wei wen weng wo wong wu
+xi xia xian xiang xiao xie xin xing xiong xiu xu xuan xue xun
+ya yan yang yao ye yi yin ying yo yong you yu yuan yue yun
+za zai zan zang zao ze zei zen zeng zha zhai zhan zhang zhao zhe zhei zhen zheng zhi zhong zhou zhu zhua
+zhuai zhuan zhuang zhui zhun zhuo zi zong zou zu zuan zui zun zuo
+""".split())
+
+MAX_SYLLABLE_LENGTH = max(len(syllable) for syllable in SYLLABLES)
+
+# Tone-marked letters -> (base letter, tone), syllabic nasals included
+TONED_LETTERS: Dict[str, Tuple[str, str]] = {
+    tone_char: ("ü" if base == "v" else base, tone) for tone_char, (base, tone) in TONE_MARKS.items()
+}
+TONED_LETTERS.update({"ḿ": ("m", "2"), "ń": ("n", "2"), "ň": ("n", "3"), "ǹ": ("n", "4"),
+                      "ế": ("ê", "2"), "ề": ("ê", "4")})
+
+VOWELS = "aeiouüê"
+
+# Syllabic nasals, only taken as a syllable of a word when nothing else fits
+NASALS = frozenset(("m", "n", "ng", "hm", "hng"))
+
+# Syllables that may not follow another one without an apostrophe ("xī'ān", not "xīān")
+VOWEL_INITIALS = "aoe"
+
+# Entries per pool task of the entry rules
+ENTRY_CHUNK = 5000
+
+RULES = ("inventory", "tone-mark", "syllable-count", "apostrophe", "duplicate", "conflict", "literal-duplicate")
+
+
+class Issue(NamedTuple):
+    path: str
+    key: str
+    rule: str
+    message: str
+
+
+class ParsedMap(NamedTuple):
+    path: str
+    entries: List[Tuple[str, Tuple[str, ...]]]
+    issues: List[Issue]
+
+
+def detone(reading: str) -> Tuple[str, List[int]]:
+    """Lowercase toneless reading and the positions of its tone-marked letters"""
+    letters = []
+    marks = []
+    for char in reading.lower():
+        toned = TONED_LETTERS.get(char)
+        if toned is None:
+            letters.append(char)
+        else:
+            marks.append(len(letters))
+            letters.append(toned[0])
+    return "".join(letters), marks
+
+
+def tone_vowel(syllable: str) -> Optional[int]:
+    """Index of the letter that carries the tone mark: a or e, the o of ou, else the last vowel"""
+    for vowel in "aeê":
+        if vowel in syllable:
+            return syllable.index(vowel)
+    if "ou" in syllable:
+        return syllable.index("ou")
+    for index in range(len(syllable) - 1, -1, -1):
+        if syllable[index] in VOWELS:
+            return index
+    # Syllabic nasals: hm, ng, m, n carry the mark on their first nasal
+    for index, letter in enumerate(syllable):
+        if letter in "mn":
+            return index
+    return None
+
+
+def _syllable_score(syllable: str, start: int, marks: List[int]) -> Tuple[int, int, int, int]:
+    """Score of one syllable at a position: (tone problems, 1, inner vowel-initial, nasal)"""
+    inside = [mark - start for mark in marks if start <= mark < start + len(syllable)]
+    problem = len(inside) > 1 or (len(inside) == 1 and inside[0] != tone_vowel(syllable))
+    return (int(problem), 1, int(start > 0 and syllable[0] in VOWEL_INITIALS), int(syllable in NASALS))
+
+
+def _tone_problems(syllables: Sequence[str], marks: List[int]) -> List[str]:
+    problems = []
+    start = 0
+    for syllable in syllables:
+        end = start + len(syllable)
+        inside = [mark - start for mark in marks if start <= mark < end]
+        if len(inside) > 1:
+            problems.append(f"{syllable} has {len(inside)} tone marks")
+        elif inside and inside[0] != tone_vowel(syllable):
+            problems.append(f"tone mark of {syllable} is on {syllable[inside[0]]!r}, not {syllable[tone_vowel(syllable)]!r}")
+        start = end
+    return problems
+
+
+def natural_segmentation(toneless: str, marks: List[int]) -> Optional[Tuple[str, ...]]:
+    """How a reader splits an unspaced reading: the fewest syllables that fit the tone marks
+
+    Tone marks disambiguate: "xīān" splits into xi|an, since xian would carry
+    two marks. Ties go to splits without inner vowel-initial syllables, then
+    without syllabic nasals. None if the reading does not split at all.
+
+    Every score term is a per-syllable sum, so the best split of each suffix
+    is found once, right to left, in time linear in the reading's length.
+    """
+    length = len(toneless)
+    # best[i]: (score, first syllable) of the best split of toneless[i:]
+    best: List[Optional[Tuple[Tuple[int, int, int, int], str]]] = [None] * (length + 1)
+    best[length] = ((0, 0, 0, 0), "")
+    for start in range(length - 1, -1, -1):
+        # Longest syllable first, so ties keep the longest head
+        for end in range(min(length, start + MAX_SYLLABLE_LENGTH), start, -1):
+            syllable = toneless[start:end]
+            if best[end] is None or syllable not in SYLLABLES:
+                continue
+            score = tuple(a + b for a, b in zip(_syllable_score(syllable, start, marks), best[end][0]))
+            if best[start] is None or score < best[start][0]:
+                best[start] = (score, syllable)
+    if not length or best[0] is None:
+        return None
+    split = []
+    start = 0
+    while start < length:
+        syllable = best[start][1]
+        split.append(syllable)
+        start += len(syllable)
+    return tuple(split)
+
+
+@lru_cache(maxsize=None)
+def check_reading(reading: str, count: int) -> Tuple[Tuple[str, str], ...]:
+    """(rule, message) problems of one reading of a key of count characters
+
+    Readings are cached: most single characters share a few hundred readings.
+    """
+    chunks = [chunk for chunk in reading.replace("'", " ").replace("’", " ").split(" ") if chunk]
+    if not chunks:
+        return (("inventory", f"empty reading {reading!r}"),)
+    detoned = [detone(chunk) for chunk in chunks]
+    splits = [natural_segmentation(toneless, marks) for toneless, marks in detoned]
+    bad = [chunk for chunk, split in zip(chunks, splits) if split is None]
+    if bad:
+        return (("inventory", f"{', '.join(bad)} in {reading!r} is not made of valid syllables"),)
+
+    problems: List[Tuple[str, str]] = []
+    syllable_count = sum(len(split) for split in splits)
+    if syllable_count != count:
+        problems.append(("syllable-count", f"{reading!r} reads as {syllable_count} syllable(s) "
+                                           f"({' '.join(' '.join(split) for split in splits)}), not {count}"))
+    for chunk, (_, marks), split in zip(chunks, detoned, splits):
+        for problem in _tone_problems(split, marks):
+            problems.append(("tone-mark", f"{problem} in {reading!r}"))
+        start = len(split[0])
+        for syllable in split[1:]:
+            # Only a marked vowel-initial syllable is misread without the apostrophe (xīān)
+            if syllable[0] in VOWEL_INITIALS and any(start <= mark < start + len(syllable) for mark in marks):
+                problems.append(("apostrophe", f"{chunk!r} needs an apostrophe before {syllable!r}"))
+            start += len(syllable)
+    return tuple(problems)
+
+
+def check_entries(path: str, entries: Sequence[Tuple[str, Sequence[str]]]) -> List[Issue]:
+    """Run the per-entry rules over entries of one map"""
+    issues = []
+    for key, readings in entries:
+        count = len(key)
+        for reading in readings:
+            for rule, message in check_reading(reading, count):
+                issues.append(Issue(path, key, rule, message))
+    return issues
+
+
+def parse_map(path: Union[str, Path]) -> ParsedMap:
+    """Read a map once, keeping its entries and reporting repeated keys"""
+    path = str(path)
+    entries = []
+    issues = []
+    seen: Dict[str, Tuple[str, ...]] = {}
+    for key, readings in iter_map_entries(path):
+        readings = tuple(readings)
+        previous = seen.get(key)
+        if previous is not None:
+            detail = "same readings" if previous == readings else f"{', '.join(previous)} vs {', '.join(readings)}"
+            issues.append(Issue(path, key, "duplicate", f"key appears more than once ({detail})"))
+        seen[key] = readings
+        entries.append((key, readings))
+    return ParsedMap(path, entries, issues)
+
+
+def check_map(path: Union[str, Path]) -> ParsedMap:
+    """Parse a map and run the per-entry rules over it, all in this process"""
+    parsed = parse_map(path)
+    parsed.issues.extend(check_entries(parsed.path, parsed.entries))
+    return parsed
+
+
+def check_copies(maps: Sequence[ParsedMap]) -> List[Issue]:
+    """Compare maps that are copies of one another (same file name) key by key"""
+    groups: Dict[str, List[ParsedMap]] = {}
+    for parsed in maps:
+        groups.setdefault(os.path.basename(parsed.path), []).append(parsed)
+    issues = []
+    for copies in groups.values():
+        if len(copies) < 2:
+            continue
+        # Last occurrence wins, as when the apps load the map
+        runs = [sorted(dict(parsed.entries).items()) for parsed in copies]
+        for key, readings in merge_entries(runs):
+            if len(set(readings)) > 1:
+                listing = "; ".join(
+                    f"{os.path.relpath(parsed.path, PROJECT_ROOT)}: {'missing' if entry is None else ', '.join(entry)}"
+                    for parsed, entry in zip(copies, readings)
+                )
+                issues.append(Issue(copies[0].path, key, "conflict", f"copies disagree ({listing})"))
+    return issues
+
+
+def duplicate_literal_keys(path: Union[str, Path]) -> List[Issue]:
+    """Keys repeated inside a dict literal of a Python script (e.g. the add_*.py word lists)"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), str(path))
+    issues = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Dict):
+            continue
+        seen = set()
+        for key in node.keys:
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                if key.value in seen:
+                    issues.append(Issue(str(path), key.value, "literal-duplicate",
+                                        f"dict literal repeats the key on line {key.lineno}"))
+                seen.add(key.value)
+    return issues
+
+
+def validate(paths: Sequence[Union[str, Path]],
+             scripts: Iterable[Union[str, Path]] = (),
+             workers: Optional[int] = None) -> List[Issue]:
+    """Validate maps (and the dict literals of scripts), returning issues grouped by rule
+
+    Each map is parsed once, in its own pool task, and its entries are
+    checked in chunks of ENTRY_CHUNK across the pool; workers defaults to
+    os.cpu_count() and workers=1 checks in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        maps = [check_map(path) for path in paths]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            maps = pool.map(parse_map, [str(path) for path in paths], chunksize=1)
+            owners = []
+            chunks = []
+            for parsed in maps:
+                for start in range(0, len(parsed.entries), ENTRY_CHUNK):
+                    owners.append(parsed)
+                    chunks.append((parsed.path, parsed.entries[start:start + ENTRY_CHUNK]))
+            for parsed, chunk_issues in zip(owners, pool.starmap(check_entries, chunks)):
+                parsed.issues.extend(chunk_issues)
+
+    issues: List[Issue] = []
+    for parsed in maps:
+        issues.extend(parsed.issues)
+    issues.extend(check_copies(maps))
+    for script in scripts:
+        issues.extend(duplicate_literal_keys(script))
+    issues.sort(key=lambda issue: RULES.index(issue.rule))
+    return issues
@@ -0,0 +1,225 @@
+"""
+NumPy conversion backend for large batches (requires numpy)
+
+A batch of texts is encoded into one UTF-32 code point array. Code points
+map to output tokens through a dense lookup table, word matches are found
+for all positions at once by comparing fixed-width windows of the array
+against the sorted words of each length, and the output of the whole batch
+is joined in one pass. Results are identical to Converter's "longest"
+segmentation, byte for byte.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .dictionary import spaced_reading, word_keys
+from .engine import ConversionResult, is_cjk_unified
+from .formatting import ToneForms, check_tone_style
+from .syllables import SyllableTable
+
+# Code point table size: all of Unicode
+CODEPOINT_LIMIT = 0x110000
+
+# Placed between texts in the batch array; no dictionary word contains it
+SEPARATOR = 0xFFFF
+
+NO_TOKEN = -1
+
+# Code points fit in 21 bits, so words of up to three characters pack into one integer
+CODEPOINT_BITS = 21
+MAX_PACKED_LENGTH = 64 // CODEPOINT_BITS
+
+
+def pack_word(word: str) -> int:
+    """Code points of a short word packed into one integer, first character highest"""
+    packed = 0
+    for char in word:
+        packed = packed << CODEPOINT_BITS | ord(char)
+    return packed
+
+
+class VectorizedConverter:
+    """Converts batches of texts with NumPy, matching Converter's output"""
+
+    def __init__(self, pinyin_map: Mapping[str, Sequence[str]]):
+        """Build the word tables; single characters are added to the token table on first use"""
+        self._lookup = pinyin_map.get
+        words = word_keys(pinyin_map)
+
+        # Output tokens: words first, then single code points as batches reach them
+        self._tokens: List[str] = []
+        self._token_keys: List[str] = []
+        self._token_readings: List[Sequence[str]] = []
+        self._detail_tokens: Dict[str, List[str]] = {}
+        self._zhuyin_tokens: List[str] = []
+        self._token_array = np.empty(0, dtype=object)
+        self._token_lengths = np.empty(0, dtype=np.int64)
+        for word in words:
+            self._add_token(word, pinyin_map[word], spaced_reading(pinyin_map, word))
+        self._char_tokens = np.full(CODEPOINT_LIMIT, NO_TOKEN, dtype=np.int32)
+
+        # Per word length: sorted keys (packed integers, or big-endian UTF-32
+        # for longer words) and their token IDs
+        self._words_by_length: Dict[int, tuple] = {}
+        by_length: Dict[int, List[int]] = {}
+        for token, word in enumerate(words):
+            by_length.setdefault(len(word), []).append(token)
+        for length, tokens in sorted(by_length.items()):
+            if length <= MAX_PACKED_LENGTH:
+                keys = np.array([pack_word(words[token]) for token in tokens], dtype=np.uint64)
+            else:
+                keys = np.array([words[token].encode("utf-32-be") for token in tokens], dtype=f"S{4 * length}")
+            order = np.argsort(keys)
+            self._words_by_length[length] = (keys[order], np.array(tokens, dtype=np.int32)[order])
+
+        syllables = getattr(pinyin_map, "syllables", None)
+        if syllables is None:
+            syllables = SyllableTable(reading for readings in pinyin_map.values() for reading in readings)
+        self.forms = ToneForms(syllables)
+        self._spaced: Dict[str, str] = dict(zip(syllables.marks, syllables.spaced))
+
+    def _add_token(self, key: str, readings, spaced: Optional[str] = None) -> int:
+        """Append the output of one segment; readings None for a character missing from the map"""
+        if readings is None:
+            self._tokens.append(key + " " if is_cjk_unified(key) else key)
+            readings = ()
+        else:
+            self._tokens.append((spaced if spaced is not None else self._spaced[readings[0]]) + " ")
+        self._token_keys.append(key)
+        self._token_readings.append(readings)
+        return len(self._tokens) - 1
+
+    def _fill_codepoints(self, codes: np.ndarray):
+        """Give every code point of the batch a token, looking new ones up in the map"""
+        missing = np.unique(codes[self._char_tokens[codes] == NO_TOKEN])
+        if not len(missing):
+            return
+        for code in missing.tolist():
+            char = chr(code)
+            self._char_tokens[code] = self._add_token(char, self._lookup(char))
+        self._token_array = np.array(self._tokens, dtype=object)
+        self._token_lengths = np.fromiter(map(len, self._tokens), dtype=np.int64, count=len(self._tokens))
+
+    def _details(self, tone: str) -> np.ndarray:
+        """Detail text per token in a tone style, empty for single-reading tokens"""
+        details = self._detail_tokens.setdefault(tone, [])
+        for token in range(len(details), len(self._tokens)):
+            readings = self._token_readings[token]
+            if len(readings) > 1:
+                if tone != "mark":
+                    readings = [self.forms.render_reading(reading, tone) for reading in readings]
+                details.append(f"{self._token_keys[token]}: {', '.join(readings)} ")
+            else:
+                details.append("")
+        return np.array(details, dtype=object)
+
+    def _zhuyin(self):
+        """Token strings and lengths with dictionary segments in zhuyin style; other text unchanged"""
+        tokens = self._zhuyin_tokens
+        zhuyin = self.forms.zhuyin
+        for token in range(len(tokens), len(self._tokens)):
+            output = self._tokens[token]
+            tokens.append(zhuyin(output[:-1]) + " " if self._token_readings[token] else output)
+        return (np.array(tokens, dtype=object),
+                np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens)))
+
+    def _match_words(self, codes: np.ndarray):
+        """Longest word starting at each position, as (length, token) arrays; length 0 for none"""
+        best_length = np.zeros(len(codes), dtype=np.int8)
+        best_token = np.zeros(len(codes), dtype=np.int32)
+        unsigned = codes.astype(np.uint64)
+        big_endian = None
+        # Ascending lengths, so a longer word overwrites a shorter one at the same start
+        for length, (keys, tokens) in self._words_by_length.items():
+            if length > len(codes):
+                break
+            count = len(codes) - length + 1
+            if length <= MAX_PACKED_LENGTH:
+                windows = unsigned[:count].copy()
+                for offset in range(1, length):
+                    windows <<= CODEPOINT_BITS
+                    windows |= unsigned[offset:offset + count]
+            else:
+                if big_endian is None:
+                    big_endian = codes.astype(">u4")
+                windows = np.ascontiguousarray(sliding_window_view(big_endian, length))
+                windows = windows.view(f"S{4 * length}").ravel()
+            index = np.searchsorted(keys, windows)
+            np.minimum(index, len(keys) - 1, out=index)
+            hits = np.flatnonzero(keys[index] == windows)
+            best_length[hits] = length
+            best_token[hits] = tokens[index[hits]]
+        return best_length, best_token
+
+    def convert_batch(self, texts: Sequence[str], tone: str = "mark",
+                      details: bool = False) -> List[Union[str, ConversionResult]]:
+        """Convert texts in order; strings, or ConversionResults when details is true"""
+        check_tone_style(tone)
+        if not texts:
+            return []
+        codes = np.frombuffer(chr(SEPARATOR).join(texts).encode("utf-32-le", "surrogatepass"), dtype="<u4").astype(np.int64)
+        self._fill_codepoints(codes)
+        token_ids = self._char_tokens[codes]
+
+        # Greedy left-to-right walk over word starts, as in Converter: a word is
+        # taken unless an earlier taken word covers its start
+        best_length, best_token = self._match_words(codes)
+        candidates = np.flatnonzero(best_length)
+        lengths = best_length[candidates].tolist()
+        taken: List[int] = []
+        covered_until = 0
+        for start, length in zip(candidates.tolist(), lengths):
+            if start >= covered_until:
+                taken.append(start)
+                covered_until = start + length
+        taken = np.array(taken, dtype=np.int64)
+        token_ids[taken] = best_token[taken]
+
+        # Drop the rest of each word and the separators
+        coverage = np.zeros(len(codes) + 1, dtype=np.int32)
+        np.add.at(coverage, taken + 1, 1)
+        np.add.at(coverage, taken + best_length[taken], -1)
+        keep = np.cumsum(coverage[:-1]) == 0
+        text_lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        separators = np.cumsum(text_lengths[:-1] + 1) - 1
+        keep[separators] = False
+        kept_before = np.concatenate(([0], np.cumsum(keep)))
+        text_starts = np.concatenate(([0], separators + 1))
+        text_ends = text_starts + text_lengths
+        token_ids = token_ids[keep]
+        token_bounds = np.stack((kept_before[text_starts], kept_before[text_ends]), axis=1)
+
+        if tone == "zhuyin":
+            pinyin = self._join(*self._zhuyin(), token_ids, token_bounds)
+        else:
+            pinyin = self._join(self._token_array, self._token_lengths, token_ids, token_bounds)
+        if tone != "mark" and tone != "zhuyin":
+            pinyin = [self.forms.render(result, tone) for result in pinyin]
+        if not details:
+            return pinyin
+        detail_array = self._details(tone)
+        detail_lengths = np.fromiter(map(len, detail_array), dtype=np.int64, count=len(detail_array))
+        detail_text = self._join(detail_array, detail_lengths, token_ids, token_bounds)
+        return [ConversionResult(result, detail) for result, detail in zip(pinyin, detail_text)]
+
+    @staticmethod
+    def _join(strings: np.ndarray, string_lengths: np.ndarray, token_ids: np.ndarray,
+              token_bounds: np.ndarray) -> List[str]:
+        """Join the tokens of the whole batch at once, then cut and strip each text"""
+        joined = "".join(strings[token_ids].tolist())
+        offsets = np.concatenate(([0], np.cumsum(string_lengths[token_ids])))
+        return [joined[start:end].strip() for start, end in offsets[token_bounds].tolist()]
+
+    def convert_many(self, texts: Iterable[str], tone: str = "mark", details: bool = False,
+                     batch_size: int = 4096) -> Iterable[Union[str, ConversionResult]]:
+        """Convert an iterable of texts in batches of batch_size, in input order"""
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                yield from self.convert_batch(batch, tone, details)
+                batch = []
+        if batch:
+            yield from self.convert_batch(batch, tone, details)
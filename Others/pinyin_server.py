@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Serve pinyin conversion over HTTP, batching concurrent requests
+
+Examples:
+    python3 pinyin_server.py --port 8765
+    curl -s localhost:8765/convert -d '{"text": "银行家", "tone": "number"}'
+    curl -s localhost:8765/stats
+"""
+
+import argparse
+import asyncio
+import time
+
+from pinyin_engine import Converter, load_dictionary, with_overlay
+from pinyin_engine.dictionary import DEFAULT_MAP_PATH
+from pinyin_engine.server import ConversionServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local pinyin conversion server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--source", default=str(DEFAULT_MAP_PATH), help="pinyin_map.json to convert with")
+    parser.add_argument("--max-batch", type=int, default=64, help="texts per micro-batch")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0, help="longest wait before a batch runs")
+    parser.add_argument("--cache-size", type=int, default=4096, help="cache of recently converted texts")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converter = Converter(with_overlay(load_dictionary(args.source), args.source), cache_size=args.cache_size)
+    print(f"Dictionary loaded in {time.perf_counter() - start:.2f}s")
+
+    server = ConversionServer(converter, max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    print(f"Listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Check the pinyin_map variants (and the word lists of the add_*.py scripts)
+
+Examples:
+    python3 validate_pinyin_maps.py
+    python3 validate_pinyin_maps.py ../PinYin_Web/pinyin_map.json --rule tone-mark --rule apostrophe
+    python3 validate_pinyin_maps.py --format jsonl > issues.jsonl
+
+Exits with status 1 when any issue is found, so it can gate dictionary edits.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from pinyin_engine.dictionary import PROJECT_ROOT
+from pinyin_engine.mapdiff import PLATFORMS, find_map_files
+from pinyin_engine.validate import RULES, validate
+
+
+def find_scripts():
+    """The add_*.py scripts of every platform"""
+    scripts = []
+    for name in PLATFORMS:
+        scripts.extend(sorted((PROJECT_ROOT / name).glob("add_*.py")))
+    return scripts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate pinyin_map.json files")
+    parser.add_argument("maps", nargs="*", help="map files (default: every app variant and add_*.py script)")
+    parser.add_argument("-r", "--rule", action="append", choices=RULES, help="only report these rules")
+    parser.add_argument("-f", "--format", choices=("text", "jsonl"), default="text", help="report format")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    maps = args.maps or find_map_files()
+    scripts = [] if args.maps else find_scripts()
+    start = time.perf_counter()
+    issues = validate(maps, scripts, workers=args.workers or None)
+    elapsed = time.perf_counter() - start
+    if args.rule:
+        issues = [issue for issue in issues if issue.rule in args.rule]
+
+    for issue in issues:
+        path = os.path.relpath(issue.path, PROJECT_ROOT)
+        if args.format == "jsonl":
+            record = {"path": path, "key": issue.key, "rule": issue.rule, "message": issue.message}
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            print(f"{path}: {issue.key}: [{issue.rule}] {issue.message}")
+
+    counts = Counter(issue.rule for issue in issues)
+    summary = ", ".join(f"{counts[rule]} {rule}" for rule in RULES if counts[rule]) or "no issues"
+    print(f"Checked {len(maps)} maps and {len(scripts)} scripts in {elapsed:.2f}s: {summary}", file=sys.stderr)
+    sys.exit(1 if issues else 0)
+
+
+if __name__ == "__main__":
+    main()